@@ -21,5 +21,9 @@ defaults = {'missing': ebi_null,
                 'free_response': False,
                 'magnitude': 1,
                 }
+# The number of entries kept in each provenance log, and what is recorded
+# (see `break4w.provenance.ProvenanceLog`)
+log_max_entries = 10000
+log_verbosity = 2
 
 {str: '%s', int: '%i', float: '%1.5f', bool: '%s'}
\ No newline at end of file
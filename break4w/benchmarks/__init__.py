@@ -0,0 +1,5 @@
+"""
+Synthetic data dictionaries and timed scenarios for measuring break4w
+
+Run `python -m break4w.benchmarks --help` for the command line interface.
+"""
@@ -0,0 +1,60 @@
+"""
+Runs the break4w benchmarks and writes the results as JSON
+
+Example
+-------
+    python -m break4w.benchmarks --rows 1000 100000 10000000 \
+        --output results.json
+"""
+
+import argparse
+import json
+import sys
+
+from break4w.benchmarks.scenarios import (dictionary_scenarios,
+                                          row_scenarios,
+                                          run_benchmarks,
+                                          )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m break4w.benchmarks',
+        description='Times break4w operations on synthetic data.')
+    parser.add_argument('--rows', type=int, nargs='+', 
+                        default=[1000, 10000, 100000],
+                        help='The mapping file sizes to validate')
+    parser.add_argument('--questions', type=int, default=50,
+                        help='The number of questions in the dictionary')
+    parser.add_argument('--scenarios', nargs='+', 
+                        choices=row_scenarios + dictionary_scenarios,
+                        help='The scenarios to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='The number of times each scenario is timed')
+    parser.add_argument('--cardinality', type=int, default=5,
+                        help='The number of levels in categorical questions')
+    parser.add_argument('--placeholder-rate', type=float, default=0.05,
+                        help='The fraction of placeholder values')
+    parser.add_argument('--error-rate', type=float, default=0,
+                        help='The fraction of invalid values')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-',
+                        help='The file for the JSON results (default: stdout)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(rows=args.rows, n_questions=args.questions,
+                             scenarios=args.scenarios, repeat=args.repeat,
+                             cardinality=args.cardinality,
+                             placeholder_rate=args.placeholder_rate,
+                             error_rate=args.error_rate, seed=args.seed,
+                             verbose=(args.output != '-'))
+    if args.output == '-':
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f_:
+            json.dump(results, f_, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Timed scenarios for the main data dictionary operations
+"""
+
+from collections import OrderedDict
+import datetime
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from break4w.data_dictionary import DataDictionary
+from break4w.benchmarks.synthetic import make_columns, make_map
+
+# Scenarios which depend on the number of rows in the mapping file
+row_scenarios = ['validate']
+# Scenarios which only depend on the dictionary
+dictionary_scenarios = ['read_dataframe', 'to_dataframe', 'add_question']
+
+
+def run_benchmarks(rows=(1000, 10000, 100000), n_questions=50, 
+    scenarios=None, repeat=3, mix=None, cardinality=5, placeholder_rate=0.05,
+    error_rate=0, seed=0, verbose=False):
+    """
+    Times the dictionary operations on synthetic data
+
+    Parameters
+    ----------
+    rows : iterable of int, optional
+        The mapping file sizes used for the row-dependent scenarios
+    n_questions : int, optional
+        The number of questions in the dictionary
+    scenarios : list of str, optional
+        The scenarios to run. By default, all of `row_scenarios` and
+        `dictionary_scenarios` are run.
+    repeat : int, optional
+        The number of times each scenario is timed
+    mix, cardinality : optional
+        The question types and categorical order size (see
+        `break4w.benchmarks.synthetic.make_columns`)
+    placeholder_rate, error_rate : float, optional
+        The fraction of placeholder and invalid values in the mapping file
+        (see `break4w.benchmarks.synthetic.make_map`)
+    seed : int, optional
+        The seed for the synthetic data
+    verbose : bool, optional
+        Prints each result as it is measured
+
+    Returns
+    -------
+    dict
+        The environment (`python`, `numpy`, `pandas`, `platform`, and
+        `timestamp`), the settings, and a list of `results`. Each result
+        gives the scenario, the number of rows (None for scenarios that do
+        not use a mapping file) and questions, and the `min`, `median`,
+        and all of the `times`, in seconds.
+    """
+    if scenarios is None:
+        scenarios = row_scenarios + dictionary_scenarios
+    unknown = set(scenarios) - set(row_scenarios + dictionary_scenarios)
+    if unknown:
+        raise ValueError('Unknown scenarios: %s' % ', '.join(sorted(unknown)))
+
+    columns, types = make_columns(n_questions, mix=mix, 
+                                  cardinality=cardinality, seed=seed)
+    dictionary = DataDictionary(columns, types)
+    table = dictionary.to_dataframe()
+
+    cases = []
+    for scenario in scenarios:
+        if scenario in row_scenarios:
+            cases.extend([(scenario, n_rows) for n_rows in rows])
+        else:
+            cases.append((scenario, None))
+
+    results = []
+    for scenario, n_rows in cases:
+        if n_rows is None:
+            map_ = None
+        else:
+            map_ = make_map(dictionary, n_rows, 
+                            placeholder_rate=placeholder_rate,
+                            error_rate=error_rate, seed=seed)
+        times = [_time_scenario(scenario, columns, types, table, map_)
+                 for i in range(repeat)]
+        result = OrderedDict([('scenario', scenario),
+                              ('rows', n_rows),
+                              ('questions', n_questions),
+                              ('min', min(times)),
+                              ('median', float(np.median(times))),
+                              ('times', times),
+                              ])
+        if verbose:
+            print('%-16s rows=%-10s %.4fs' % (scenario, n_rows, min(times)))
+        results.append(result)
+
+    return OrderedDict([
+        ('python', platform.python_version()),
+        ('numpy', np.__version__),
+        ('pandas', pd.__version__),
+        ('platform', platform.platform()),
+        ('timestamp', datetime.datetime.now().isoformat()),
+        ('settings', OrderedDict([('n_questions', n_questions),
+                                  ('repeat', repeat),
+                                  ('cardinality', cardinality),
+                                  ('placeholder_rate', placeholder_rate),
+                                  ('error_rate', error_rate),
+                                  ('seed', seed),
+                                  ])),
+        ('results', results),
+        ])
+
+
+def _time_scenario(scenario, columns, types, table, map_=None):
+    """Times a single run of a scenario, in seconds
+
+    Each run gets a new dictionary, so cached validators and logs from an
+    earlier run are not reused.
+    """
+    if scenario == 'read_dataframe':
+        table = table.copy()
+        start = time.perf_counter()
+        DataDictionary.read_dataframe(table)
+        return time.perf_counter() - start
+
+    if scenario == 'add_question':
+        dictionary = DataDictionary([], [])
+        start = time.perf_counter()
+        for column, type_ in zip(*(columns, types)):
+            dictionary.add_question(dict(column), type_)
+        return time.perf_counter() - start
+
+    dictionary = DataDictionary(columns, types)
+    if scenario == 'to_dataframe':
+        start = time.perf_counter()
+        dictionary.to_dataframe()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        dictionary.validate(map_)
+    except ValueError:
+        # Maps with errors are expected to fail
+        pass
+    return time.perf_counter() - start
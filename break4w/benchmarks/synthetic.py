@@ -0,0 +1,149 @@
+"""
+Generates synthetic data dictionaries and matching mapping files
+"""
+
+import numpy as np
+import pandas as pd
+
+from break4w.data_dictionary import DataDictionary
+
+# The placeholders written into the synthetic data
+placeholders = ['not applicable', 'not provided']
+
+
+def make_columns(n_questions=100, mix=None, cardinality=5, seed=None):
+    """
+    Describes a set of synthetic questions
+
+    Parameters
+    ----------
+    n_questions : int, optional
+        The number of questions
+    mix : dict, optional
+        The relative number of each question type, keyed by `'continous'`,
+        `'categorical'` and `'bool'`. By default, the types are equally
+        common.
+    cardinality : int, optional
+        The number of values in the order for categorical questions
+    seed : int, optional
+        The seed for the random number generator
+
+    Returns
+    -------
+    list of dicts
+        The question descriptions
+    list of str
+        The question types
+    """
+    if mix is None:
+        mix = {'continous': 1, 'categorical': 1, 'bool': 1}
+    rand = np.random.RandomState(seed)
+    kinds = sorted(mix)
+    weights = np.array([mix[k] for k in kinds], dtype=float)
+    types = list(rand.choice(kinds, size=n_questions, 
+                             p=weights / weights.sum()))
+
+    columns = []
+    for i, type_ in enumerate(types):
+        name = '%s_%i' % (type_, i)
+        column = {'name': name, 
+                  'description': 'A synthetic %s question' % type_}
+        if type_ == 'continous':
+            column.update({'dtype': int if (i % 2) else float,
+                           'limits': [0, 100],
+                           'units': 'units'})
+        elif type_ == 'categorical':
+            column.update({'dtype': str, 
+                           'order': ['level_%i' % j 
+                                     for j in range(cardinality)]})
+        else:
+            column.update({'dtype': bool})
+        columns.append(column)
+    return columns, types
+
+
+def make_dictionary(n_questions=100, mix=None, cardinality=5, seed=None):
+    """
+    Builds a synthetic data dictionary
+
+    Parameters
+    ----------
+    n_questions : int, optional
+        The number of questions
+    mix : dict, optional
+        The relative number of each question type, keyed by `'continous'`,
+        `'categorical'` and `'bool'`. By default, the types are equally
+        common.
+    cardinality : int, optional
+        The number of values in the order for categorical questions
+    seed : int, optional
+        The seed for the random number generator
+
+    Returns
+    -------
+    DataDictionary
+    """
+    columns, types = make_columns(n_questions, mix=mix, 
+                                  cardinality=cardinality, seed=seed)
+    return DataDictionary(columns, types, 
+                          description='Synthetic benchmark dictionary')
+
+
+def make_map(dictionary, n_rows=1000, placeholder_rate=0.05, error_rate=0,
+    seed=None):
+    """
+    Builds a mapping file described by a data dictionary
+
+    The values are written as text, as they would be read from a file.
+
+    Parameters
+    ----------
+    dictionary : DataDictionary
+        The dictionary describing the columns
+    n_rows : int, optional
+        The number of rows (samples)
+    placeholder_rate : float, optional
+        The fraction of values in each column replaced by a missing value
+        placeholder
+    error_rate : float, optional
+        The fraction of values in each column replaced by a value which
+        should fail validation (i.e. a value outside the limits, or which
+        is not in the order)
+    seed : int, optional
+        The seed for the random number generator
+
+    Returns
+    -------
+    DataFrame
+        The mapping file, indexed by sample name
+    """
+    rand = np.random.RandomState(seed)
+    map_ = {}
+    for name, question in dictionary.items():
+        if question.type == 'Continous':
+            values = rand.randint(question.limits[0], question.limits[1], 
+                                  size=n_rows).astype(str)
+            bad_value = str(question.limits[1] * 10)
+        elif question.type == 'Bool':
+            values = np.array(['true', 'false'])[rand.randint(0, 2, n_rows)]
+            bad_value = 'maybe'
+        elif question.type == 'Categorical':
+            order = np.array(question.order, dtype=object).astype(str)
+            values = order[rand.randint(0, len(order), n_rows)]
+            bad_value = 'not_a_level'
+        else:
+            values = np.array(['value_%i' % i for i in range(n_rows)])
+            bad_value = None
+        values = values.astype(object)
+
+        draw = rand.uniform(size=n_rows)
+        missing = draw < placeholder_rate
+        values[missing] = np.array(placeholders, dtype=object)[
+            rand.randint(0, len(placeholders), missing.sum())]
+        if bad_value is not None:
+            values[draw > (1 - error_rate)] = bad_value
+        map_[name] = values
+
+    index = pd.Index(['sample_%i' % i for i in range(n_rows)],
+                     name='sample_name')
+    return pd.DataFrame(map_, index=index, columns=list(dictionary.keys()))
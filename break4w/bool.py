@@ -68,7 +68,26 @@ class Bool(Categorical):
             kwargs['clean_name'] = clean_name
         if 'ref_value' not in kwargs:
             kwargs['ref_value'] = ref_value
+        # The format values are added to the defaults, and the value used
+        # for the opposite answer is removed, so a format like `[0, 1]`
+        # replaces the default meaning of 0 and 1.
+        if 'true_values' not in kwargs:
+            kwargs['true_values'] = Categorical.true_values.union(
+                _clean_format(t_format)
+                ).difference(_clean_format(f_format))
+        if 'false_values' not in kwargs:
+            kwargs['false_values'] = Categorical.false_values.union(
+                _clean_format(f_format)
+                ).difference(_clean_format(t_format))
 
         Categorical.__init__(self, **kwargs)
         self.type = 'Bool'
 
+
+def _clean_format(x):
+    """Lower cases a boolean format value so it matches lower case data"""
+    if isinstance(x, str):
+        return set([x.lower()])
+    else:
+        return set([x])
+
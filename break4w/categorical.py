@@ -3,7 +3,10 @@ import copy
 import numpy as np
 import pandas as pd
 
-from break4w.question import Question
+from pandas.api.types import CategoricalDtype
+
+from break4w.profiling import phase
+from break4w.question import Question, _intern
 
 
 class Categorical(Question):
@@ -119,6 +122,8 @@ class Categorical(Question):
 
         self.type = 'Categorical'
 
+        if isinstance(order, list):
+            order = _intern(order, list)
         self.order = order
 
         if ref_value is None:
@@ -221,50 +226,215 @@ blanks      {blanks}
             for the question (given by order) or acceptable missing values.
 
         """
-        # Gets the data to check
-        iseries = map_[self.name].copy()
-        message = []
-
-        # Attempts to remap the data
-        if self.blanks is None:
-            blanks = set([])
-        if hasattr(self, 'ambiguous') and self.ambiguous is not None:
-            ambiguous = self.ambiguous
-        else:
-            ambiguous = set([])
-
-        placeholders = self.missing.union(blanks).union(ambiguous)
-        f_ = self._identify_remap_function(dtype=self.dtype,
-                                           placeholders=placeholders,
-                                           true_values=self.true_values,
-                                           false_values=self.false_values,
-                                          )
-        dseries = iseries.apply(f_)
-        new_order = [f_(o) for o in self.order]
-
-        if dseries.apply(lambda x: x == 'error').any():
-            message = (
-                'the data cannot be cast to %s'
-                % (str(self.dtype).replace("<class '", '').replace("'>", ''))
-                )
-            self._update_log('validate', 'error', message)
-            raise TypeError(message)
+        self._check_summary(self._summarize(map_[self.name]))
+
+    def _summarize(self, series):
+        """Summarizes the cast and values of a column for validation
+
+        Returns
+        -------
+        dict
+            The summary from `Question._summarize` along with the unique
+            values which are not in the order (`'invalid_values'`) and the
+            values from the order which were seen (`'observed_values'`)
+
+        Notes
+        -----
+        Columns with a pandas categorical dtype are summarized from the
+        categories which appear in the column, so each category is cast and
+        checked once, rather than once per row.
+        """
+        if isinstance(series.dtype, CategoricalDtype):
+            codes = series.cat.codes.values
+            counts = np.bincount(codes[codes >= 0],
+                                 minlength=len(series.cat.categories))
+            used = pd.Series(series.cat.categories[counts > 0])
+            dseries, errors = self._cast_plan(used, self._validator_plan())
+            with phase('cast'):
+                errors = errors.values
+                n_errors = counts[counts > 0][errors].sum()
+                summary = {'rows': len(series),
+                           'cast_errors': int(n_errors),
+                           'error_values': np.asarray(used.values[errors],
+                                                      dtype=object),
+                           }
         else:
-            self._update_log(
-                'validate', 'pass', 'the data can be cast to %s'
-                % (str(self.dtype).replace("<class '", '').replace("'>", ''))
-                )
+            dseries, summary = self._cast_summary(series)
+        categories = self._validator_plan()['categories']
+        with phase('check'):
+            codes = pd.Categorical(dseries, dtype=categories).codes
+            invalid = (codes == -1) & dseries.notnull().values
+            counts = np.bincount(codes[codes >= 0],
+                                 minlength=len(categories.categories))
+            summary['invalid_values'] = pd.unique(dseries.values[invalid])
+            summary['observed_values'] = \
+                np.asarray(categories.categories[counts > 0], dtype=object)
+        return summary
+
+    def _group_codes(self, series):
+        """Finds the position of each response in the order
+
+        Each distinct value in the column is cast and encoded once, and
+        the codes are then expanded to every row.
+
+        Parameters
+        ----------
+        series : Series
+            The data to be encoded
+
+        Returns
+        -------
+        ndarray
+            The position of the value in the cast order, or -1 for null
+            values, placeholders, and values which cannot be cast or are
+            not in the order
+        """
+        labels, uniques = pd.factorize(series)
+        dseries, _ = self._cast_plan(pd.Series(uniques),
+                                     self._validator_plan())
+        codes = pd.Categorical(
+            dseries, dtype=self._validator_plan()['categories']
+            ).codes
+        return np.append(codes, -1)[labels]
+
+    def _count_values(self, series):
+        """Counts the responses to each value in the order
+
+        Counts from different parts of the same column can be added
+        together, so a column does not have to be held in memory all at
+        once.
+
+        Returns
+        -------
+        ndarray
+            The number of responses for each value in the cast order.
+            Placeholders and values outside the order are not counted.
+        """
+        codes = self._group_codes(series)
+        return np.bincount(
+            codes[codes >= 0],
+            minlength=len(self._validator_plan()['categories'].categories)
+            )
+
+    def _below_cutoff(self, counts):
+        """Finds the values with fewer responses than the frequency cutoff
 
-        acceptable_values = placeholders.union(set(new_order))
-        actual_values = set(dseries.unique()) - {np.nan}
+        Parameters
+        ----------
+        counts : array-like
+            The number of responses to each value in the cast order, from
+            `_count_values`
+
+        Returns
+        -------
+        ndarray
+            A boolean array which is True for each value with fewer than
+            `frequency_cutoff` responses. If there is no cutoff, every
+            value is kept.
+        """
+        counts = np.asarray(counts)
+        if self.frequency_cutoff is None:
+            return np.zeros(counts.shape, dtype=bool)
+        return counts < self.frequency_cutoff
+
+    def _error_masks(self, series):
+        """Finds the rows which cannot be cast or are not in the order
 
-        if not acceptable_values.issuperset(actual_values):
-            descriptor = ['%s' % v
-                          for v in sorted((actual_values - acceptable_values))]
+        Returns
+        -------
+        Series
+            The cast data, as returned by `Question._cast_series`
+        OrderedDict
+            Boolean arrays for values which cannot be cast (`'cast'`) and
+            values which are not in the order (`'order'`)
+        """
+        dseries, masks = Question._error_masks(self, series)
+        masks['order'] = self._check_order(
+            dseries, self._validator_plan()['categories']
+            )
+        return dseries, masks
+
+    def _check_summary(self, summary):
+        """Checks the summarized values are in the order
+
+        Raises
+        ------
+        TypeError
+            If any of the data cannot be cast to the dtype
+        ValueError
+            If there are values which are not in the order
+        """
+        Question._check_summary(self, summary)
+
+        if len(summary['invalid_values']) > 0:
+            descriptor = ['%s' % self.dtype(v)
+                          for v in sorted(summary['invalid_values'])]
             m_ = 'The following are not valid values: %s' \
                 % (' | '.join(descriptor))
-            message.append(m_)
-            self._update_log('validate', 'error', '\n'.join(message))
+            self._update_log('validate', 'error', m_)
             raise ValueError(m_)
         else:
             self._update_log('validate', 'pass', 'all values were valid')
+
+    def _compile_plan(self):
+        """Adds the cast order to the validation settings"""
+        plan = Question._compile_plan(self)
+        new_order = tuple(plan['remap'](o) for o in self.order)
+        plan.update({'order': new_order,
+                     'categories': self._order_dtype(new_order),
+                     })
+        return plan
+
+    def _snapshot_state(self, log=True):
+        """Gets the attributes and compiled validator for a snapshot
+
+        The categories are left out and rebuilt from the cast order by
+        `_from_snapshot`.
+        """
+        state, plan = Question._snapshot_state(self, log=log)
+        plan.pop('categories')
+        return state, plan
+
+    @classmethod
+    def _from_snapshot(cls, state, plan=None):
+        """Rebuilds a question from `_snapshot_state`"""
+        if plan is not None:
+            plan = dict(plan)
+            plan['categories'] = cls._order_dtype(plan['order'])
+        return super(Categorical, cls)._from_snapshot(state, plan)
+
+    @staticmethod
+    def _order_dtype(order):
+        """Converts the order into a pandas CategoricalDtype
+
+        Null values are dropped, since they cannot be categories.
+        """
+        categories = pd.Series(list(order), dtype=object).infer_objects()
+        return CategoricalDtype(pd.unique(categories.dropna()))
+
+    @staticmethod
+    def _check_order(dseries, order):
+        """Finds values which are not in the order
+
+        The order is converted to a pandas CategoricalDtype, so the column
+        can be encoded with a single hash lookup. Any non-null value which
+        is encoded as -1 is not in the order.
+
+        Parameters
+        ----------
+        dseries : Series
+            The data, already cast to the question dtype and with the
+            placeholders replaced by null values
+        order : list, CategoricalDtype
+            The acceptable values, cast to the question dtype, or the
+            CategoricalDtype built from them by `_order_dtype`
+
+        Returns
+        -------
+        ndarray
+            A boolean array which is True where the value is not valid.
+        """
+        if not isinstance(order, CategoricalDtype):
+            order = Categorical._order_dtype(order)
+        codes = pd.Categorical(dseries, dtype=order).codes
+        return (codes == -1) & dseries.notnull().values
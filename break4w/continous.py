@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 
+from break4w.profiling import phase
 from break4w.question import Question
 
 
@@ -135,76 +136,76 @@ blanks      {blanks}
             If the data in `map_` falls outside the specified limits
         """
 
-        iseries = map_[self.name].copy()
-        message = []
+        self._check_summary(self._summarize(map_[self.name]))
 
-        if pd.isnull(self.units):
-            unit_str = ''
-        else:
-            unit_str = self.units
+    def _summarize(self, series):
+        """Summarizes the cast and range of a column for validation
 
-        # Attempts to remap the data
-        if self.blanks is None:
-            blanks = set([])
-        elif isinstance(self.blanks, str):
-            blanks = set([self.blanks])
-        else:
-            blanks = set(self.blanks)
-
-        if hasattr(self, 'ambiguous') and self.ambiguous is not None:
-            if isinstance(self.ambiguous, str):
-                ambiguous = set([self.ambiguous])
-            else:
-                ambiguous = set(self.ambiguous)
-        else:
-            ambiguous = set([])
-
-        placeholders = self.missing.union(blanks).union(ambiguous)
-        f_ = self._identify_remap_function(dtype=self.dtype,
-                                           placeholders=placeholders,
-                                           true_values=self.true_values,
-                                           false_values=self.false_values,
-                                           )
-        iseries = iseries.apply(f_)
-        if np.any(iseries.apply(lambda x: x == 'error')):
-            message = (
-                'the data cannot be cast to %s'
-                % (str(self.dtype).replace("<class '", '').replace("'>", ''))
-                )
-            self._update_log('validate', 'error', message)
-            raise TypeError(message)
-        else:
-            self._update_log(
-                'validate', 'pass', 'the data can be cast to %s'
-                % (str(self.dtype).replace("<class '", '').replace("'>", '')))
+        Returns
+        -------
+        dict
+            The summary from `Question._summarize` along with the smallest
+            (`'min'`) and largest (`'max'`) values in the column
+        """
+        values, summary = self._cast_summary(series)
+        with phase('check'):
+            summary['min'], summary['max'] = _value_range(values.values)
+        return summary
+
+    def _error_masks(self, series):
+        """Finds the rows which cannot be cast or fall outside the limits
+
+        Returns
+        -------
+        Series
+            The cast data, as returned by `Question._cast_series`
+        OrderedDict
+            Boolean arrays for values which cannot be cast (`'cast'`), are
+            below the lower limit (`'lower limit'`), or are above the upper
+            limit (`'upper limit'`). The limit arrays are only built when
+            a value crosses the limit.
+        """
+        values, masks = Question._error_masks(self, series)
+        [lower_, upper_] = self._validator_plan()['limits']
+        if (lower_ is None) and (upper_ is None):
+            return values, masks
+
+        array = values.values
+        min_, max_ = _value_range(array)
+        with np.errstate(invalid='ignore'):
+            if (lower_ is not None) and (min_ < lower_):
+                masks['lower limit'] = array < lower_
+            if (upper_ is not None) and (max_ > upper_):
+                masks['upper limit'] = array > upper_
+        return values, masks
+
+    def _check_summary(self, summary):
+        """Checks the summarized values fall within the limits
 
-        iseries = iseries.replace(list(placeholders), np.nan).dropna()
-        [lower_, upper_] = self.limits
+        Raises
+        ------
+        TypeError
+            If any of the data cannot be cast to the dtype
+        ValueError
+            If the data falls outside the specified limits
+        """
+        Question._check_summary(self, summary)
 
-        # Defines the text based on the bounding values
-        if (lower_ is not None) and (upper_ is not None):
-            update_text = ('The values were between %s and %s %s'
-                           % (lower_, upper_, unit_str))
-        elif upper_ is not None:
-            update_text = ('The values were less than or equal to %s %s'
-                           % (upper_, unit_str))
-        elif lower_ is not None:
-            update_text = ('The values were greater than or equal to %s %s'
-                           % (lower_, unit_str))
-        else:
-            update_text = 'there were no limits specified'
+        plan = self._validator_plan()
+        [lower_, upper_] = plan['limits']
+        unit_str = plan['unit_str']
 
         lower_text = ''
         lower_issue = False
         if (lower_ is not None):
-            if np.any(iseries < lower_):
+            if summary['min'] < lower_:
                 lower_text = ('less than %s' % lower_)
                 lower_issue = True
 
         upper_text = ''
         upper_issue = False
         if (upper_ is not None):
-            if np.any(iseries > upper_):
+            if summary['max'] > upper_:
                 upper_text = ('greater than %s' % (upper_))
                 upper_issue = True
 
@@ -228,7 +229,37 @@ blanks      {blanks}
             raise ValueError(error_string)
         else:
             self._update_log('validate', 'pass',
-                             update_text)
+                             plan['limit_pass'])
+
+    def _compile_plan(self):
+        """Adds the limits and limit messages to the validation settings"""
+        plan = Question._compile_plan(self)
+
+        if pd.isnull(self.units):
+            unit_str = ''
+        else:
+            unit_str = self.units
+
+        [lower_, upper_] = self.limits
+
+        # Defines the text based on the bounding values
+        if (lower_ is not None) and (upper_ is not None):
+            update_text = ('The values were between %s and %s %s'
+                           % (lower_, upper_, unit_str))
+        elif upper_ is not None:
+            update_text = ('The values were less than or equal to %s %s'
+                           % (upper_, unit_str))
+        elif lower_ is not None:
+            update_text = ('The values were greater than or equal to %s %s'
+                           % (lower_, unit_str))
+        else:
+            update_text = 'there were no limits specified'
+
+        plan.update({'limits': (lower_, upper_),
+                     'unit_str': unit_str,
+                     'limit_pass': update_text,
+                     })
+        return plan
 
     @staticmethod
     def _check_limits(limits, var_name):
@@ -265,6 +296,24 @@ blanks      {blanks}
 
 
 
+def _value_range(values):
+    """Finds the smallest and largest values in an array, ignoring nulls
+
+    The values are reduced in place with `np.fmin` and `np.fmax` (which
+    `np.nanmin` and `np.nanmax` use for floats), so nulls are skipped
+    without copying the array or warning when every value is null.
+
+    Returns
+    -------
+    float, float
+        The smallest and largest values, or nan if there are no values
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return np.nan, np.nan
+    return np.fmin.reduce(values), np.fmax.reduce(values)
+
+
 def _check_cmap(x):
     """Checks that a read object qualifies as a colormap
 
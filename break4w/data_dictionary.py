@@ -4,19 +4,29 @@ write yet. This will be really important?
 """
 
 from collections import OrderedDict
-import datetime
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
+import gc
+import hashlib
+import json
+import os
+import pickle
 import pydoc
+import struct
+import tempfile
 
 import numpy as np
 import pandas as pd
 
 from pandas.api.types import CategoricalDtype
 
-from break4w.question import Question
+from break4w.question import Question, _interning, error_columns
 from break4w.categorical import Categorical
 from break4w.bool import Bool
 from break4w.continous import Continous
 import break4w._defaults as b4wdefaults
+from break4w.profiling import _measure, _null
+from break4w.provenance import ProvenanceLog, attach_store, open_store
 
 type_lookup = {'continous': Continous,
                'categorical': Categorical,
@@ -27,6 +37,20 @@ type_lookup = {'continous': Continous,
                'yes/no': Bool,
                }
 
+# The header written at the start of a dictionary snapshot. The version
+# should be increased whenever the snapshot contents change.
+snapshot_magic = b'B4WSNAP'
+snapshot_version = 1
+
+# The columns of the count table from `DataDictionary.count_values`
+count_columns = ['column', 'value', 'count', 'below_cutoff']
+
+# The columns of the report from `DataDictionary.validate_many`
+report_columns = ['map', 'column', 'passed', 'message']
+
+# The snapshot path and dictionary loaded by each `validate_many` worker
+# process
+_worker_dictionary = (None, None)
 
 
 class DataDictionary(OrderedDict):
@@ -49,18 +73,24 @@ class DataDictionary(OrderedDict):
     description: str
         A description of the data dictionary or study of no more than
         80 characters.
+    lazy: bool, optional
+        Keeps the column descriptions as they were passed in, and only
+        builds the question object for a column when it is first accessed
+        (i.e. through `get_question`, indexing, `values`, or `items`). The
+        names, question types and descriptions are available without
+        building any questions.
 
     """
     default_cols = ['name', 'description', 'type', 'dtype', 'order', 
                     'units', 'ambigious', 'missing', 'notes']
 
-    def __init__(self, columns, types, description=None):
+    def __init__(self, columns, types, description=None, lazy=False):
         """Initializes the dictionary object
 
         This is a very basic prototype of the data dictionary object
         """
 
-        self.log = []
+        self.log = ProvenanceLog()
         if description is None:
             self.description = ''
         elif len(description) > 80:
@@ -70,12 +100,69 @@ class DataDictionary(OrderedDict):
             self.description = description
 
         # Adds the question objects to the dictionary
-        for col_, type_ in zip(*(columns, types)):
-            self.add_question(question_data=col_,
-                              question_type=type_,
-                              record=False,
-                              check=False)
-        self.columns = list(self.keys())
+        if lazy:
+            columns = [
+                col_ if isinstance(col_, (Question, _LazyQuestion)) else
+                _LazyQuestion(type_lookup.get(type_.lower(), Question), col_)
+                for col_, type_ in zip(*(columns, types))
+                ]
+        self.add_questions(columns, types, record=False, check=False)
+
+    def __getitem__(self, name):
+        """Gets a question, building it if the dictionary is lazy"""
+        question = OrderedDict.__getitem__(self, name)
+        if isinstance(question, _LazyQuestion):
+            question = question.build()
+            OrderedDict.__setitem__(self, name, question)
+            self._attach_store(question)
+        return question
+
+    def __eq__(self, other):
+        """Compares the dictionaries, building any lazy questions"""
+        self._build_questions()
+        if isinstance(other, DataDictionary):
+            other._build_questions()
+        return OrderedDict.__eq__(self, other)
+
+    def get(self, name, default=None):
+        """Gets a question, or `default` if there is no entry"""
+        if name in self:
+            return self[name]
+        return default
+
+    def pop(self, name, *args):
+        """Removes and returns a question"""
+        if name in self:
+            self.__getitem__(name)
+        return OrderedDict.pop(self, name, *args)
+
+    def popitem(self, last=True):
+        """Removes and returns the last (or first) name and question"""
+        if len(self) > 0:
+            name = next(reversed(self)) if last else next(iter(self))
+            self.__getitem__(name)
+        return OrderedDict.popitem(self, last)
+
+    def setdefault(self, name, default=None):
+        """Gets a question, adding `default` if there is no entry"""
+        if name in self:
+            return self[name]
+        return OrderedDict.setdefault(self, name, default)
+
+    def values(self):
+        """Gets the questions, building any lazy questions"""
+        self._build_questions()
+        return OrderedDict.values(self)
+
+    def items(self):
+        """Gets the names and questions, building any lazy questions"""
+        self._build_questions()
+        return OrderedDict.items(self)
+
+    def _build_questions(self):
+        """Builds any questions which have not been accessed yet"""
+        for name in self.keys():
+            self.__getitem__(name)
 
     def __str__(self):
         """
@@ -87,7 +174,9 @@ class DataDictionary(OrderedDict):
         summary.append('-----------------------------------------------------'
                        '-------------------------------')
                   
-        for col in self.values():
+        # Lazy questions know their name, type, and description, so they
+        # do not need to be built
+        for col in OrderedDict.values(self):
             summary.append('%s (%s)\n\t%s' % (col.name, col.type, col.description))
         summary.append('-----------------------------------------------------'
                        '-------------------------------')
@@ -117,17 +206,118 @@ class DataDictionary(OrderedDict):
             Explains exactly how values were changed.
 
         """
-        self.log.append({
-            'timestamp': datetime.datetime.now(),
-            'column': column,
-            'command': command,
-            'transform_type': transform_type,
-            'transformation': transformation,
-            })
+        self.log.record(command, column=column, 
+                        transform_type=transform_type,
+                        transformation=transformation)
 
     def _pull_question_log(self, column=None):
-        """Adds information from the specified column to the log."""
-        raise NotImplementedError
+        """Adds information from the specified column to the log.
+
+        The entries from the question logs are added in time order. They
+        are not written to the dictionary's provenance file, since the
+        questions write their own entries.
+
+        Parameters
+        ----------
+        column: str, optional
+            The question whose log should be added. If this is not
+            supplied, the logs from all the questions which have been built
+            are added.
+
+        Raises
+        ------
+        ValueError
+            When the column is not in the dictionary
+        """
+        if column is None:
+            questions = [q for q in OrderedDict.values(self) 
+                         if isinstance(q, Question)]
+        elif column in self.keys():
+            questions = [self[column]]
+        else:
+            raise ValueError('There is no entry for %s' % column)
+
+        entries = [entry for question in questions for entry in question.log]
+        entries.sort(key=lambda entry: entry['timestamp'])
+        self.log.load(entries)
+
+    def write_provenance(self, fp_=None, batch_size=1000):
+        """Streams the dictionary and question provenance to a file
+
+        Parameters
+        ----------
+        fp_ : str, optional
+            An append-only file (JSON Lines, or SQLite if the file ends in
+            `.db`, `.sqlite`, or `.sqlite3`). The current logs are added to
+            the file, and all later entries from the dictionary and its
+            questions are written to it in batches of `batch_size`.
+        batch_size : int, optional
+            The number of entries held in memory before they are written
+
+        Returns
+        -------
+        DataFrame
+            The dictionary log, describing the time, column, action taken,
+            action type, and changes in the data.
+        """
+        if fp_ is not None:
+            store = self.log.store
+            if (store is None) or (store.path != fp_):
+                store = open_store(fp_, batch_size=batch_size)
+            attach_store(self.log, store)
+            for question in OrderedDict.values(self):
+                self._attach_store(question)
+        return self.log.to_frame()
+
+    def query_log(self, column=None, command=None, transform_type=None,
+        since=None):
+        """Finds entries in the dictionary and question logs
+
+        The logs are indexed on the column and command, so only the
+        matching entries are checked. When a column is given, only the
+        dictionary log and that question's log are searched.
+
+        Parameters
+        ----------
+        column : str, optional
+            Only returns entries for this column
+        command : str, optional
+            Only returns entries for this command
+        transform_type : str, optional
+            Only returns entries with this transform type
+        since : datetime, optional
+            Only returns entries from this time onwards
+
+        Returns
+        -------
+        list of dicts
+            The matching entries, in time order. Entries which were copied
+            from a question log to the dictionary log are only returned once.
+        """
+        if column is None:
+            questions = OrderedDict.values(self)
+        else:
+            questions = [OrderedDict.get(self, column)]
+        logs = [self.log] + [q.log for q in questions 
+                             if isinstance(q, Question)]
+
+        def _key(entry):
+            return tuple(repr(v) for v in entry.values())
+
+        entries = [log.query(column=column, command=command, 
+                             transform_type=transform_type, since=since)
+                   for log in logs]
+        copied = set(_key(entry) for entry in entries[0])
+        entries = entries[0] + [entry for log_entries in entries[1:] 
+                                for entry in log_entries
+                                if _key(entry) not in copied]
+        entries.sort(key=lambda entry: entry['timestamp'])
+        return entries
+
+    def _attach_store(self, question):
+        """Streams a question log to the dictionary's provenance file"""
+        if (self.log.store is not None) and isinstance(question, Question):
+            attach_store(question.log, self.log.store)
 
     def add_question(self, question_data, question_type='',
         check=True, record=True, var_delim=' | ', code_delim='=', 
@@ -184,33 +374,14 @@ class DataDictionary(OrderedDict):
         """
         error1 = False
 
-        # Converts to a Question object
-        question_object = type_lookup.get(question_type.lower(), Question)
-
-        if isinstance(question_data, pd.Series):
-            question_data.dropna(inplace=True)
-            question_data = question_object._read_series(
-                question_data, var_delim=var_delim, 
-                code_delim=code_delim, null_value=null_value,
-                )
-        elif isinstance(question_data, dict):
-            question_data = question_object(**question_data)
-        elif isinstance(question_data, Question):
-            pass
-        else:
-            message = ('question_data must be a Question, dict, or'
-                       ' Series')
-            if record:
-                self._update_log('add column', 
-                                 column=None, 
-                                 transformation=message,
-                                 transform_type='error')
-            raise ValueError(message)
-
+        question_data = self._convert_question(
+            question_data, question_type, record=record, var_delim=var_delim,
+            code_delim=code_delim, null_value=null_value)
         name = question_data.name
+        exists = name in self.keys()
 
         # Checks if the question is in the dictionary
-        if (name in self.keys()) and check:
+        if exists and check:
             error1 = True
             message = '%s already has a dictionary entry' % name
             transform_type = 'error'
@@ -230,7 +401,111 @@ class DataDictionary(OrderedDict):
             raise ValueError(message)
         else:
             self[name] = question_data
-            self.columns = list(self.keys())
+            self._attach_store(question_data)
+            if not exists:
+                self.columns.append(name)
+
+    def add_questions(self, question_data, question_types=None, check=True,
+        record=True, var_delim=' | ', code_delim='=', null_value='None'):
+        """
+        Adds several question objects to the data dictionary
+
+        All the questions are converted and checked before any are added,
+        so either every question is added or none are. A single entry is
+        added to the log.
+
+        Parameters
+        ----------
+        question_data: iterable of Dict, Question, or Series
+            Describes the data dictionary entry for each question. (See
+            `add_question`.)
+        question_types: iterable of str, optional
+            The type of question object that should be selected for each
+            question. If this is not supplied, `question_data` must hold
+            `Question` objects.
+        check: bool, optional
+            Checks whether the names are already in the dictionary or are
+            repeated in `question_data`.
+        record, bool, optional
+            Indicates where the addition should be logged.
+        val_delim: str, optional
+            The seperator between values in the "order" column.
+        code_delim: str, optional
+            The delimiter between a numericly coded categorical variable and
+            the value it maps to.
+
+        Raises
+        ------
+        ValueError
+            When `check` is True and any of the question names are already
+            in the dictionary, or appear more than once.
+
+        """
+        question_data = list(question_data)
+        if question_types is None:
+            question_types = [''] * len(question_data)
+
+        with _interning():
+            questions = [
+                self._convert_question(data_, type_, record=record,
+                                       var_delim=var_delim,
+                                       code_delim=code_delim,
+                                       null_value=null_value)
+                for data_, type_ in zip(*(question_data, question_types))
+                ]
+
+        if check:
+            seen = set(self.keys())
+            repeated = []
+            for question in questions:
+                if question.name in seen:
+                    repeated.append(question.name)
+                seen.add(question.name)
+            if repeated:
+                message = ('The following already have dictionary entries: '
+                           '%s' % '; '.join(repeated))
+                if record:
+                    self._update_log('add columns', 
+                                     transformation=message,
+                                     transform_type='error')
+                raise ValueError(message)
+
+        for question in questions:
+            self[question.name] = question
+            self._attach_store(question)
+        self.columns = list(self.keys())
+
+        if record:
+            self._update_log('add columns', 
+                             transformation='%i questions were added to the '
+                                            'dictionary' % len(questions))
+
+    def _convert_question(self, question_data, question_type='', 
+        record=True, var_delim=' | ', code_delim='=', null_value='None'):
+        """Converts the description of a question to a Question object"""
+        question_object = type_lookup.get(question_type.lower(), Question)
+
+        if isinstance(question_data, pd.Series):
+            question_data.dropna(inplace=True)
+            question_data = question_object._read_series(
+                question_data, var_delim=var_delim, 
+                code_delim=code_delim, null_value=null_value,
+                )
+        elif isinstance(question_data, dict):
+            question_data = question_object(**question_data)
+        elif isinstance(question_data, (Question, _LazyQuestion)):
+            pass
+        else:
+            message = ('question_data must be a Question, dict, or'
+                       ' Series')
+            if record:
+                self._update_log('add column', 
+                                 column=None, 
+                                 transformation=message,
+                                 transform_type='error')
+            raise ValueError(message)
+
+        return question_data
 
     def get_question(self, name):
         """
@@ -273,7 +548,7 @@ class DataDictionary(OrderedDict):
         """
         if name in self.keys():
             del self[name]
-            self.columns = list(self.keys())
+            self.columns.remove(name)
             self._update_log(command='remove question', column=name)
 
     def update_question(self, update, name=None):
@@ -314,7 +589,7 @@ class DataDictionary(OrderedDict):
         current = vars(self[name])
         diff = {k: v for k, v in update.items()
                 if (((k not in current) or (v != current[k])) and
-                    (k not in {'log'}))
+                    (k not in {'log'}) and not k.startswith('_'))
                 }
         change_keys = {}
         for k, v in diff.items():
@@ -332,7 +607,8 @@ class DataDictionary(OrderedDict):
             transformation=' | '.join(['%s : %s > %s' % (k, v[0], v[1])
                                        for k, v in change_keys.items()]))
 
-    def validate(self, map_, check_order=True):
+    def validate(self, map_, check_order=True, workers=None, executor=None,
+        incremental=False, cache=None, profile=None):
         """
         Checks columns appear in the mapping file in the appropriate order
         and conform to the standards set in the data dictionary.
@@ -344,22 +620,655 @@ class DataDictionary(OrderedDict):
         check_order: bool, optional
             Do the order of columns in the data dictionary and metadata have
             to match?
+        workers: int, optional
+            The number of questions to validate at the same time. Columns
+            stored as numpy arrays are validated in a thread pool, and
+            columns with an object dtype (whose validation holds the GIL)
+            are validated in a process pool. By default, questions are
+            validated one at a time.
+        executor: Executor, optional
+            A `concurrent.futures` style executor used to validate all
+            the questions. If an executor is supplied, `workers` is ignored.
+        incremental: bool, optional
+            Skips questions whose data and definition are unchanged since
+            they last passed validation. The data is compared using a hash
+            of the column (see `pandas.util.hash_pandas_object`), and the
+            hashes from the last passing validation are kept on the
+            question.
+        cache: str, optional
+            The path to a JSON file where the hashes from passing
+            validations are stored, so they can be reused by other
+            processes. Implies `incremental`.
+        profile: ValidationProfile, optional
+            Collects the wall time, rows, bytes, and time spent in each
+            phase of validation for every question which is validated (see
+            `break4w.profiling.ValidationProfile`). The records are added,
+            and any callbacks called, as each question finishes. Questions
+            skipped by `incremental` are not profiled.
+
+        Raises
+        ------
+        ValueError
+            If any of the columns fail validation. Each column is validated,
+            and the log for each question is added to the dictionary log
+            in dictionary order, regardless of the order in which the
+            questions finished.
         """
-        pass_ = True
-        failures = []
-        fail_message = []
         self._validate_question_order(map_, check_order)
+
+        questions = [(name, question) for name, question in self.items()
+                     if question.type != 'Question']
+        if incremental or (cache is not None):
+            results = self._validate_incremental(map_, questions, cache,
+                                                 workers, executor, profile)
+        else:
+            results = self._validate_questions(map_, questions, workers,
+                                               executor, profile)
+        self._report_validation(questions, results)
+
+    def _validate_incremental(self, map_, questions, cache=None,
+        workers=None, executor=None, profile=None):
+        """Validates the questions which have changed since they last passed
+
+        Parameters
+        ----------
+        map_ : DataFrame
+            A pandas object containing the metadata being analyzed.
+        questions : list of tuples
+            The name and question object for each question to validate
+        cache: str, optional
+            The path to a JSON file with the hashes from passing
+            validations. The file is updated with the new results.
+        workers: int, optional
+            The number of questions to validate at the same time.
+        executor: Executor, optional
+            A `concurrent.futures` style executor used to validate the
+            questions.
+        profile: ValidationProfile, optional
+            Collects the timings for the questions which are validated
+
+        Returns
+        -------
+        list of tuples
+            Whether each question passed, the log entries it added, its
+            profile record (or None), and its validation message, in the
+            same order as `questions`.
+        """
+        stored = {}
+        if (cache is not None) and os.path.exists(cache):
+            # A cache which cannot be read is rebuilt
+            try:
+                with open(cache, 'r') as f_:
+                    stored = json.load(f_)
+            except (OSError, ValueError):
+                pass
+
+        prints = {name: [question._definition_fingerprint(),
+                         _data_fingerprint(map_[name])]
+                  for name, question in questions}
+
+        def _unchanged(name, question):
+            return ((question.__dict__.get('_passed') == prints[name]) or
+                    (stored.get(name) == prints[name]))
+
+        to_check = [(name, question) for name, question in questions
+                    if not _unchanged(name, question)]
+        checked = dict(zip(
+            [name for name, _ in to_check],
+            self._validate_questions(map_, to_check, workers, executor,
+                                     profile)
+            ))
+
+        results = []
+        for name, question in questions:
+            if name in checked:
+                passed = checked[name][0]
+                results.append(checked[name])
+            else:
+                passed = True
+                message = ('the data and definition have not changed since '
+                           'the last passing validation')
+                start = question.log.recorded
+                question._update_log('validate', 'pass', message)
+                results.append((True, question.log.since(start), None,
+                                message))
+
+            if passed:
+                question._passed = prints[name]
+                stored[name] = prints[name]
+            else:
+                question._passed = None
+                stored.pop(name, None)
+
+        if cache is not None:
+            _write_cache(cache, stored)
+
+        return results
+
+    def find_errors(self, map_):
+        """
+        Lists every value in the mapping file which fails validation
+
+        This is a companion to `validate` which does not raise an error.
+        Each column is cast once, and every row which cannot be cast, is not
+        in the order, or falls outside the limits is reported, so all the
+        problems in a file can be fixed at once.
+
+        Parameters
+        ----------
+        map_ : DataFrame
+            A pandas object containing the metadata being analyzed.
+
+        Returns
+        -------
+        DataFrame
+            The question name (`column`), the row index (`index`), the
+            value (`value`), and the rule it broke (`rule`; one of `'cast'`,
+            `'order'`, `'lower limit'`, `'upper limit'`, or `'missing
+            column'` if the question is not in the mapping file).
+        """
+        tables = []
         for name, question in self.items():
             if question.type == 'Question':
                 continue
-            try:
-                question.validate(map_)
-            except:
-                pass_ = False
-                failures.append(
-                    '\t%s - %s' % (name, question.log[-1]['transformation'])
+            elif name not in map_.columns:
+                tables.append(pd.DataFrame({'column': [name],
+                                            'index': [np.nan],
+                                            'value': [np.nan],
+                                            'rule': ['missing column']},
+                                           columns=error_columns))
+            else:
+                tables.append(question._find_errors(map_[name]))
+
+        if len(tables) > 0:
+            errors = pd.concat(tables, ignore_index=True)
+        else:
+            errors = pd.DataFrame(columns=error_columns)
+
+        if len(errors) == 0:
+            self._update_log('find errors', transform_type='pass',
+                             transformation='There were no errors')
+        else:
+            self._update_log(
+                'find errors', transform_type='error',
+                transformation=('There were %i errors in %i columns'
+                                % (len(errors), errors['column'].nunique()))
+                )
+        return errors
+
+    def count_values(self, map_, chunksize=100000, sep=None, **kwargs):
+        """
+        Counts the responses to every categorical question
+
+        Each chunk of the data is read once, and the counts for each
+        question are added together, so the counts can be taken from a
+        cohort which does not fit in memory. The counts are compared to
+        the `frequency_cutoff` for each question.
+
+        Parameters
+        ----------
+        map_ : DataFrame, str, iterable of DataFrames
+            The metadata being counted. This can be a DataFrame, the path
+            to a delimited text file (which is read `chunksize` rows at a
+            time), or an iterable of DataFrames (i.e. the chunks from
+            `pandas.read_csv`).
+        chunksize : int, optional
+            The number of rows to read at a time from a file
+        sep : str, optional
+            The delimiter for the file. By default, files ending in `.tsv`
+            or `.txt` are read as tab delimited and all other files are
+            read as comma delimited.
+        **kwargs
+            Additional arguments passed to `pandas.read_csv`. Unless
+            another `dtype` is given, the data is read as strings.
+
+        Returns
+        -------
+        DataFrame
+            The question name (`column`), the value from the order
+            (`value`), the number of responses (`count`), and whether
+            there are fewer responses than the question's frequency cutoff
+            (`below_cutoff`), for each value of each categorical question
+            in the data. Placeholders and values which are not in the
+            order are not counted.
+        """
+        questions = [(name, question) for name, question in self.items()
+                     if isinstance(question, Categorical)]
+        counts = OrderedDict()
+        for chunk in _iter_chunks(map_, chunksize, sep, **kwargs):
+            for name, question in questions:
+                if name not in chunk.columns:
+                    continue
+                chunk_counts = question._count_values(chunk[name])
+                if name in counts:
+                    counts[name] = counts[name] + chunk_counts
+                else:
+                    counts[name] = chunk_counts
+
+        table = OrderedDict([(column, []) for column in count_columns])
+        for name, question in questions:
+            if name not in counts:
+                continue
+            values = question._validator_plan()['categories'].categories
+            table['column'].extend([name] * len(values))
+            table['value'].extend(values)
+            table['count'].extend(counts[name].tolist())
+            table['below_cutoff'].extend(
+                question._below_cutoff(counts[name]).tolist()
+                )
+        return pd.DataFrame(table, columns=count_columns).astype(
+            {'value': object, 'count': int, 'below_cutoff': bool}
+            )
+
+    def apply_cutoffs(self, map_, counts=None, value=np.nan, record=True):
+        """
+        Collapses the responses in groups below the frequency cutoff
+
+        Parameters
+        ----------
+        map_ : DataFrame
+            A pandas object containing the metadata being analyzed.
+        counts : DataFrame, optional
+            The count table from `count_values`. When the data is processed
+            in chunks, the counts should be taken from the whole data set
+            (i.e. `count_values(path)`), so every chunk is collapsed the
+            same way. By default, the counts are taken from `map_`.
+        value : optional
+            The value used to replace responses in groups below the cutoff
+            (i.e. `'other'`). By default, they are replaced by null values.
+        record : bool, optional
+            Whether the groups which were collapsed should be recorded in
+            the log.
+
+        Returns
+        -------
+        DataFrame
+            A copy of `map_` where the responses to each categorical
+            question which fall in a group below the cutoff are replaced
+            by `value`
+        """
+        if counts is None:
+            counts = self.count_values(map_)
+        map_ = map_.copy()
+        below = counts[counts['below_cutoff'].values]
+
+        for name, group in below.groupby('column', sort=False):
+            if name not in map_.columns:
+                continue
+            question = self[name]
+            values = question._validator_plan()['categories'].categories
+            collapse = question._group_codes(map_[name])
+            collapse = np.in1d(collapse, values.get_indexer(group['value']))
+            if not collapse.any():
+                continue
+
+            series = map_[name]
+            if (isinstance(series.dtype, CategoricalDtype) and
+                    not pd.isnull(value) and
+                    value not in series.cat.categories):
+                series = series.cat.add_categories([value])
+            map_[name] = series.where(~collapse, value)
+
+            if record:
+                self._update_log(
+                    'apply cutoffs', column=name,
+                    transform_type='collapse',
+                    transformation=(
+                        '%i responses in groups with fewer than %s '
+                        'responses were replaced with %s: %s'
+                        % (collapse.sum(), question.frequency_cutoff, value,
+                           ' | '.join(['%s' % v for v in group['value']]))
+                        ))
+        return map_
+
+    def read_csv(self, path, sep=None, validate=True, check_order=True,
+        **kwargs):
+        """
+        Reads a mapping file, using the dictionary to set the column types
+
+        The column types and placeholder values are taken from the questions,
+        so the C parser in `pandas.read_csv` does the casting. Float
+        questions are read as floats, with the missing, blank, and
+        ambiguous values read as null values. Integer, categorical and
+        boolean questions are read as pandas categories, keeping the
+        placeholders, so each unique value is only checked once. (Integers
+        are not parsed as floats, since text like `1.0` cannot be cast to
+        an integer.) Once the data has passed validation, the categories
+        are cast to the question dtype (i.e. `1` rather than `'1'`, or
+        `True` rather than `'yes'`), while placeholders are kept as text.
+        If the data is not validated, the categories are left as text.
+        Columns which are not in the dictionary are not read.
+
+        If the parser cannot cast a column, the file is read again as text
+        so validation can describe the problem.
+
+        Parameters
+        ----------
+        path : str
+            The path to a delimited text file containing the metadata
+        sep : str, optional
+            The delimiter for the file. By default, files ending in `.tsv`
+            or `.txt` are read as tab delimited and all other files are
+            read as comma delimited.
+        validate : bool, optional
+            Whether the data should be validated after it is read
+        check_order: bool, optional
+            Do the order of columns in the data dictionary and metadata have
+            to match?
+        **kwargs
+            Additional arguments passed to `pandas.read_csv` (for example,
+            `index_col=0` if the first column holds the sample ids).
+
+        Returns
+        -------
+        DataFrame
+            The mapping file, with columns cast using the dictionary. Float
+            questions are float columns, integer, boolean and categorical
+            questions are category columns, and free text questions are
+            object columns.
+
+        Raises
+        ------
+        ValueError
+            If `validate` is True and the columns do not match the
+            dictionary, or any of the columns fail validation.
+        """
+        if sep is None:
+            sep = _infer_sep(path)
+
+        # The columns are selected by position, since the index column may
+        # not have a name in the header
+        index_col = kwargs.pop('index_col', None)
+        header = pd.read_csv(path, sep=sep, nrows=0, **kwargs).columns
+        if index_col is None or index_col is False:
+            index_pos = []
+        elif isinstance(index_col, (list, tuple)):
+            index_pos = [_column_position(header, c) for c in index_col]
+        else:
+            index_pos = [_column_position(header, index_col)]
+        columns = [(i, c) for i, c in enumerate(header)
+                   if i not in index_pos]
+        if validate:
+            self._validate_question_order(
+                pd.DataFrame(columns=[c for i, c in columns]), check_order)
+        usecols = sorted(index_pos + [i for i, c in columns if c in self])
+        if index_pos:
+            kwargs['index_col'] = [usecols.index(i) for i in index_pos]
+            if not isinstance(index_col, (list, tuple)):
+                kwargs['index_col'] = kwargs['index_col'][0]
+
+        dtypes = {}
+        na_values = {}
+        for name in [header[i] for i in usecols if i not in index_pos]:
+            question = self[name]
+            if question.type == 'Question':
+                dtypes[name] = str
+            elif question.dtype is float:
+                dtypes[name] = float
+                na_values[name] = \
+                    list(question._validator_plan()['placeholders'])
+            else:
+                dtypes[name] = 'category'
+
+        # Some versions of pandas cannot combine per-column null values with
+        # an unnamed index column, so they are only passed when needed
+        try:
+            map_ = pd.read_csv(path, sep=sep, usecols=usecols, dtype=dtypes,
+                               na_values=na_values or None, **kwargs)
+        except (ValueError, TypeError):
+            map_ = pd.read_csv(path, sep=sep, usecols=usecols, dtype=str,
+                               **kwargs)
+
+        if validate:
+            self.validate(map_, check_order=check_order)
+            for name in map_.columns:
+                if (isinstance(map_[name].dtype, CategoricalDtype) and
+                        (self[name].dtype is not str)):
+                    map_[name] = _cast_categories(map_[name], self[name])
+        return map_
+
+    def validate_file(self, path, chunksize=100000, check_order=True,
+        sep=None, **kwargs):
+        """
+        Validates a mapping file without reading the whole file into memory
+
+        The file is read `chunksize` rows at a time. Each question summarizes
+        each chunk (i.e. the values which could not be cast, the values
+        which are not in the order, and the smallest and largest values),
+        and the combined summaries are checked at the end, so memory use
+        depends on the chunk size and not the file size.
+
+        Parameters
+        ----------
+        path : str
+            The path to a delimited text file containing the metadata
+        chunksize : int, optional
+            The number of rows to read at a time
+        check_order: bool, optional
+            Do the order of columns in the data dictionary and metadata have
+            to match?
+        sep : str, optional
+            The delimiter for the file. By default, files ending in `.tsv`
+            or `.txt` are read as tab delimited and all other files are
+            read as comma delimited.
+        **kwargs
+            Additional arguments passed to `pandas.read_csv` (for example,
+            `index_col=0` if the first column holds the sample ids). Unless
+            another `dtype` is given, the data is read as strings.
+
+        Raises
+        ------
+        ValueError
+            If the columns do not match the dictionary, or any of the columns
+            fail validation.
+        """
+        if sep is None:
+            sep = _infer_sep(path)
+        kwargs.setdefault('dtype', str)
+
+        questions = [(name, question) for name, question in self.items()
+                     if question.type != 'Question']
+        summaries = [None] * len(questions)
+
+        checked = False
+        for chunk in pd.read_csv(path, sep=sep, chunksize=chunksize, **kwargs):
+            if not checked:
+                self._validate_question_order(chunk, check_order)
+                checked = True
+            for i, (name, question) in enumerate(questions):
+                summaries[i] = question._merge_summaries(
+                    summaries[i], question._summarize(chunk[name])
                     )
-            self.log.append(question.log[-1])
+        if not checked:
+            header = pd.read_csv(path, sep=sep, nrows=0, **kwargs)
+            self._validate_question_order(header, check_order)
+            summaries = [question._summarize(header[name])
+                         for name, question in questions]
+
+        results = [_validate_question(question, summary=summary)
+                   for (name, question), summary in zip(questions, summaries)]
+        self._report_validation(questions, results)
+
+    def validate_append(self, map_, check_order=True, full_file=False,
+        reset=False):
+        """
+        Validates rows appended to a mapping file which was already checked
+
+        The dictionary remembers the number of rows which have passed and
+        a summary of each column (the values which could not be cast, the
+        values seen for categorical questions, and the smallest and largest
+        values for continous questions). New rows are summarized and
+        combined with the stored summary, so each batch only costs as much
+        as the number of new rows. The stored state is only updated when
+        the batch passes, so a failed batch can be fixed and checked again.
+
+        Parameters
+        ----------
+        map_ : DataFrame
+            The rows added to the mapping file since the last call. If
+            `full_file` is True, this is the whole mapping file.
+        check_order: bool, optional
+            Do the order of columns in the data dictionary and metadata have
+            to match?
+        full_file: bool, optional
+            Whether `map_` is the full mapping file, in which case only the
+            rows after those which have already been validated are checked.
+        reset: bool, optional
+            Forgets the previously validated rows, so `map_` is treated as
+            the beginning of the file.
+
+        Returns
+        -------
+        int
+            The total number of rows which have been validated
+
+        Raises
+        ------
+        ValueError
+            If the columns do not match the dictionary, any of the columns
+            fail validation, or a question has changed since the earlier
+            rows were validated.
+        """
+        if reset or ('_append_rows' not in self.__dict__):
+            self._append_rows = 0
+            self._append_summaries = {}
+        if full_file:
+            map_ = map_.iloc[self._append_rows:]
+
+        self._validate_question_order(map_, check_order)
+        questions = [(name, question) for name, question in self.items()
+                     if question.type != 'Question']
+
+        definitions = {}
+        for name, question in questions:
+            definitions[name] = question._definition_fingerprint()
+            previous, _ = self._append_summaries.get(name, (None, None))
+            if (self._append_rows > 0) and (previous != definitions[name]):
+                message = ('The definition of %s has changed since the '
+                           'earlier rows were validated. Please validate '
+                           'the full file with `reset=True`.' % name)
+                self._update_log('validate', column=name,
+                                 transform_type='error',
+                                 transformation=message)
+                raise ValueError(message)
+
+        summaries = {name: question._merge_summaries(
+                        self._append_summaries.get(name, (None, None))[1],
+                        question._summarize(map_[name])
+                        )
+                     for name, question in questions}
+        results = [_validate_question(question, summary=summaries[name])
+                   for name, question in questions]
+        self._report_validation(questions, results)
+
+        self._append_rows += len(map_)
+        self._append_summaries = {name: (definitions[name], summaries[name])
+                                  for name, _ in questions}
+        return self._append_rows
+
+    def validate_many(self, maps, workers=None, check_order=True, sep=None,
+        **kwargs):
+        """
+        Validates many mapping files against the dictionary
+
+        Unlike `validate`, this does not stop at a failing file. Every file
+        is checked, and the results are returned as a single report. With
+        more than one worker, the compiled dictionary is written to a
+        snapshot (see `save_snapshot`) which each worker process loads
+        once, before its first file, and the files are validated at the
+        same time.
+
+        Parameters
+        ----------
+        maps : iterable of DataFrames or str
+            The mapping files to validate. Each can be a DataFrame or the
+            path to a delimited text file, which is read as strings.
+        workers: int, optional
+            The number of processes used to validate the files. By default,
+            the files are validated one at a time in this process.
+        check_order: bool, optional
+            Do the order of columns in the data dictionary and metadata have
+            to match?
+        sep : str, optional
+            The delimiter for the files. By default, files ending in `.tsv`
+            or `.txt` are read as tab delimited and all other files are
+            read as comma delimited.
+        **kwargs
+            Additional arguments passed to `pandas.read_csv` (for example,
+            `index_col=0` if the first column holds the sample ids).
+
+        Returns
+        -------
+        DataFrame
+            The path, or position for DataFrames, of the mapping file
+            (`map`), the question name (`column`), whether the question
+            passed (`passed`), and the last log message for the question
+            (`message`). The first row for each file checks the columns
+            (with a null `column`); if the columns do not match, the
+            questions are not validated.
+        """
+        maps = list(maps)
+        labels = [map_ if isinstance(map_, (str, os.PathLike)) else i
+                  for i, map_ in enumerate(maps)]
+        read = dict(check_order=check_order, sep=sep, read_kwargs=kwargs)
+
+        if (workers is None) or (workers <= 1):
+            results = [_validate_map(self, map_, **read) for map_ in maps]
+        else:
+            with tempfile.TemporaryDirectory() as dir_:
+                snapshot = os.path.join(dir_, 'dictionary.b4w')
+                self.save_snapshot(snapshot)
+                with ProcessPoolExecutor(workers) as processes:
+                    futures = [processes.submit(_validate_worker_map,
+                                                snapshot, map_, **read)
+                               for map_ in maps]
+                    results = [future.result() for future in futures]
+
+        report = pd.DataFrame(
+            [(label,) + row for label, rows in zip(labels, results)
+             for row in rows],
+            columns=report_columns,
+            )
+        failed = report.loc[~report['passed'].astype(bool), 'map'].unique()
+        self._update_log(
+            'validate many',
+            transform_type=('pass' if len(failed) == 0 else 'error'),
+            transformation=('%i of %i mapping files passed'
+                            % (len(maps) - len(failed), len(maps))),
+            )
+        return report
+
+    def _report_validation(self, questions, results):
+        """Adds question validation results to the log
+
+        Parameters
+        ----------
+        questions : list of tuples
+            The name and question object for each question validated
+        results : list of tuples
+            Whether each question passed, the log entries it added, its
+            profile record, and its validation message
+
+        Raises
+        ------
+        ValueError
+            If any of the questions failed validation
+        """
+        pass_ = True
+        failures = []
+        for (name, question), (passed, entries, _, message) in \
+                zip(questions, results):
+            _merge_log(question, entries)
+            if not passed:
+                pass_ = False
+                failures.append('\t%s - %s' % (name, message))
+            # Questions streaming to the same file have already written the
+            # entry
+            if (self.log.store is not None and 
+                    question.log.store is self.log.store):
+                self.log.load(entries[-1:])
+            else:
+                self.log.extend(entries[-1:])
 
         if pass_:
             self._update_log('validate', transform_type='pass',
@@ -375,6 +1284,77 @@ class DataDictionary(OrderedDict):
                              transformation=message_l)
             raise ValueError(message)
 
+    @staticmethod
+    def _validate_questions(map_, questions, workers=None, executor=None,
+        profile=None):
+        """Validates a list of questions, possibly at the same time
+
+        Parameters
+        ----------
+        map_ : DataFrame
+            A pandas object containing the metadata being analyzed.
+        questions : list of tuples
+            The name and question object for each question to validate
+        workers: int, optional
+            The number of questions to validate at the same time.
+        executor: Executor, optional
+            A `concurrent.futures` style executor used to validate the
+            questions.
+        profile: ValidationProfile, optional
+            Collects the timings for each question as it finishes
+
+        Returns
+        -------
+        list of tuples
+            Whether each question passed, the log entries it added, its
+            profile record (or None), and its validation message, in the
+            same order as `questions`.
+        """
+        timed = profile is not None
+        if executor is not None:
+            futures = [executor.submit(_validate_question, question,
+                                       map_[name].to_frame(), profile=timed)
+                       for name, question in questions]
+            return _gather(futures, profile)
+        elif (workers is None) or (workers <= 1):
+            results = []
+            for name, question in questions:
+                results.append(_validate_question(question, map_,
+                                                  profile=timed))
+                if timed:
+                    profile.add(results[-1][2])
+            return results
+
+        is_object = [map_[name].dtype == object for name, _ in questions]
+        futures = [None] * len(questions)
+        # The process pool work is submitted before the thread pool starts,
+        # so the worker processes are not forked while other threads hold
+        # locks (i.e. the provenance label lock)
+        if any(is_object):
+            processes = ProcessPoolExecutor(workers)
+        else:
+            processes = None
+        try:
+            for i, ((name, question), object_) in \
+                    enumerate(zip(questions, is_object)):
+                if object_:
+                    futures[i] = processes.submit(
+                        _validate_question, question, map_[name].to_frame(),
+                        profile=timed,
+                        )
+            with ThreadPoolExecutor(workers) as threads:
+                for i, ((name, question), object_) in \
+                        enumerate(zip(questions, is_object)):
+                    if not object_:
+                        futures[i] = threads.submit(
+                            _validate_question, question,
+                            map_[name].to_frame(), profile=timed,
+                            )
+                return _gather(futures, profile)
+        finally:
+            if processes is not None:
+                processes.shutdown()
+
     def _validate_question_order(self, map_, check_order=True, record=True,
         verbose=False):
         """
@@ -482,14 +1462,23 @@ class DataDictionary(OrderedDict):
 
         """
 
-        cols = []
+        # Gathers each attribute across the questions, keeping the columns
+        # in the order they first appear
+        records = []
+        columns = OrderedDict()
         for col in self.values():
-            ser_ = col._to_series()
-            # if isinstance(col, Continous):
-            ser_.rename({'limits': 'order'}, inplace=True)
-            cols.append(ser_)
-
-        df_ = pd.concat(axis=1, sort=False, objs=cols).T
+            rec_ = col._to_dict()
+            if 'limits' in rec_:
+                rec_ = OrderedDict((('order' if k == 'limits' else k), v)
+                                   for k, v in rec_.items())
+            records.append(rec_)
+            columns.update((k, None) for k in rec_)
+
+        df_ = pd.DataFrame(
+            OrderedDict((k, [rec_.get(k, np.nan) for rec_ in records])
+                        for k in columns),
+            columns=list(columns), dtype=object,
+            )
 
         if ('var_labels' in df_.columns):
             df_.loc[df_['var_labels'].notna(), 'order'] = \
@@ -504,6 +1493,102 @@ class DataDictionary(OrderedDict):
 
         return df_.set_index('name')
 
+    def save_snapshot(self, path, log=False):
+        """
+        Saves the compiled dictionary to a binary snapshot
+
+        A snapshot holds the question attributes, with their types, and the
+        compiled validator settings, so `load_snapshot` does not need to
+        parse text or rebuild the validators. Identical placeholder sets,
+        orders and messages are only stored once.
+
+        Parameters
+        ----------
+        path : str
+            The file to write
+        log : bool, optional
+            Whether the dictionary and question logs should be saved
+
+        """
+        interned = {}
+
+        def _intern(k, v):
+            # The repr is part of the key, so `{1}` and `{True}` are kept
+            # apart even though they are equal
+            return interned.setdefault((k, type(v), repr(v)), v)
+
+        questions = []
+        for question in self.values():
+            state, plan = question._snapshot_state(log=log)
+            plan = {k: _intern(k, v) for k, v in plan.items()}
+            questions.append((type(question), state, plan))
+
+        payload = {'description': self.description,
+                   'log': self.log if log else ProvenanceLog(
+                       max_entries=self.log.max_entries, 
+                       verbosity=self.log.verbosity),
+                   'questions': questions,
+                   }
+        with open(path, 'wb') as f_:
+            f_.write(snapshot_magic)
+            f_.write(struct.pack('<H', snapshot_version))
+            pickle.dump(payload, f_, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """
+        Loads a dictionary from a snapshot written by `save_snapshot`
+
+        The snapshot is a pickle, so it should only be loaded from a
+        trusted source.
+
+        Parameters
+        ----------
+        path : str
+            The snapshot file
+
+        Returns
+        -------
+        DataDictionary
+            The dictionary, with the validators already compiled
+
+        Raises
+        ------
+        ValueError
+            If the file is not a snapshot, or was written with a different
+            snapshot version
+
+        """
+        header_size = len(snapshot_magic) + 2
+        with open(path, 'rb') as f_:
+            header = f_.read(header_size)
+            if ((len(header) < header_size) or 
+                    (header[:len(snapshot_magic)] != snapshot_magic)):
+                raise ValueError('%s is not a data dictionary snapshot' 
+                                 % path)
+            version, = struct.unpack('<H', header[len(snapshot_magic):])
+            if version != snapshot_version:
+                raise ValueError('The snapshot was written with version %i, '
+                                 'but only version %i can be read'
+                                 % (version, snapshot_version))
+            # None of the loaded objects are garbage, so the collector is
+            # paused rather than repeatedly scanning the new objects
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                payload = pickle.load(f_)
+                dict_ = cls([], [], description=payload['description'])
+                for qclass, state, plan in payload['questions']:
+                    question = qclass._from_snapshot(state, plan)
+                    dict_[question.name] = question
+            finally:
+                if gc_enabled:
+                    gc.enable()
+
+        dict_.columns = list(dict_.keys())
+        dict_.log = payload['log']
+        return dict_
+
     def to_pandas_stata(self):
         """
         Generates strings and dictionary compatible with writing to stata
@@ -526,7 +1611,7 @@ class DataDictionary(OrderedDict):
 
     @classmethod
     def read_dataframe(cls, df_, description=None, var_delim=' | ', 
-        code_delim='=', null_value='None'):
+        code_delim='=', null_value='None', lazy=False):
         """Builds the data dictionary from a dataframe
 
         Parameters
@@ -550,6 +1635,9 @@ class DataDictionary(OrderedDict):
         code_delim: str, optional
             The delimiter between a numericly coded categorical variable and
             the value it maps to.
+        lazy: bool, optional
+            Keeps the rows of the dataframe, and only builds the question for
+            a row when it is first accessed.
 
         Returns
         -------
@@ -560,23 +1648,33 @@ class DataDictionary(OrderedDict):
         --------
 
         """
-        types = []
-        cols = []
         if 'name' not in df_.columns:
             df_.reset_index(inplace=True)
 
-        for name_, var_ in df_.iterrows():
-            # Describes the question type
-            type_ = var_['type']
-            qclass = type_lookup.get(type_.lower(), Question)
-            var_.drop('type', inplace=True)
-
-            # Updates the column and type objects
-            types.append(type_)
-            cols.append(qclass._read_series(var_.dropna(), 
-                                            var_delim=var_delim, 
-                                            code_delim=code_delim, 
-                                            null_value=null_value))
+        if lazy:
+            types = list(df_['type'].values)
+            rows = df_.drop(columns=['type']).to_dict('records')
+            cols = [_LazyQuestion(type_lookup.get(type_.lower(), Question),
+                                  row_, var_delim=var_delim,
+                                  code_delim=code_delim, 
+                                  null_value=null_value)
+                    for type_, row_ in zip(*(types, rows))]
+            return cls(columns=cols, types=types, description=description)
+
+        # Builds the questions for each type together, and then puts them
+        # back in the original order
+        types = list(df_['type'].values)
+        cols = [None] * len(types)
+        groups = df_.groupby(df_['type'].str.lower(), sort=False).indices
+        with _interning():
+            for type_, positions in groups.items():
+                qclass = type_lookup.get(type_, Question)
+                group = df_.iloc[positions].dropna(axis=1, how='all')
+                questions = qclass._read_frame(group, var_delim=var_delim, 
+                                               code_delim=code_delim, 
+                                               null_value=null_value)
+                for pos_, question in zip(positions, questions):
+                    cols[pos_] = question
 
         return cls(columns=cols, types=types, description=description)
 
@@ -590,3 +1688,239 @@ class DataDictionary(OrderedDict):
         pass
 
 
+class _LazyQuestion(object):
+    """Holds the description of a question until the question is needed
+
+    Parameters
+    ----------
+    qclass : type
+        The Question class to build
+    data : dict, Series
+        The question parameters. A dictionary is passed directly to the
+        class, while a Series, or a row read from a dictionary table (when
+        any reading arguments are given), is parsed with `_read_series`.
+    **read_kwargs
+        The delimiters and null value used to parse a table row
+    """
+    def __init__(self, qclass, data, **read_kwargs):
+        self.qclass = qclass
+        self.data = data
+        self.read_kwargs = read_kwargs
+        self.name = data['name']
+        self.description = data.get('description')
+        self.type = qclass.__name__
+
+    def build(self):
+        """Creates the question object
+
+        The question is built in an `_interning` block, like the questions
+        built all at once, so its placeholders and order are immutable.
+        """
+        with _interning():
+            if isinstance(self.data, dict) and not self.read_kwargs:
+                return self.qclass(**self.data)
+            var_ = pd.Series(self.data, dtype=object).dropna()
+            return self.qclass._read_series(var_, **self.read_kwargs)
+
+
+def _validate_question(question, map_=None, summary=None, profile=False):
+    """Validates a single question and returns the new log entries
+
+    This lives at the module level so it can be sent to a process pool.
+    If a `summary` is supplied, the summary is checked instead of the data
+    in `map_`.
+
+    Returns
+    -------
+    bool
+        Whether the question passed validation
+    list
+        The entries added to the question log during validation
+    OrderedDict
+        The timings for the question, if `profile` is True. Otherwise, this
+        is None.
+    str
+        The reason the question failed, or the last message from a
+        passing validation. This does not depend on what the log records.
+    """
+    start = question.log.recorded
+    if profile:
+        timer = _measure(question, map_[question.name])
+    else:
+        timer = _null
+    with timer as record:
+        try:
+            if summary is None:
+                question.validate(map_)
+            else:
+                question._check_summary(summary)
+            passed = True
+        except Exception as e:
+            passed = False
+            message = str(e)
+    entries = question.log.since(start)
+    if passed:
+        if len(entries) > 0:
+            message = entries[-1]['transformation']
+        else:
+            message = 'the data passed validation'
+    if record is not None:
+        record['passed'] = passed
+    return passed, entries, record, message
+
+
+def _validate_map(dictionary, map_, check_order=True, sep=None,
+    read_kwargs=None):
+    """Validates one mapping file, without adding to the dictionary log
+
+    Returns
+    -------
+    list of tuples
+        The question name, whether it passed, and the last log message, for
+        the column check (with a name of None) and each question
+    """
+    if isinstance(map_, (str, os.PathLike)):
+        read_kwargs = dict(read_kwargs or {})
+        read_kwargs.setdefault('dtype', str)
+        if sep is None:
+            sep = _infer_sep(map_)
+        map_ = pd.read_csv(map_, sep=sep, **read_kwargs)
+
+    try:
+        dictionary._validate_question_order(map_, check_order, record=False)
+    except ValueError as e:
+        return [(None, False, str(e))]
+
+    rows = [(None, True, 'The columns in the mapping file match the '
+                         'columns in the data dictionary.')]
+    for name, question in dictionary.items():
+        if question.type == 'Question':
+            continue
+        passed, _, _, message = _validate_question(question, map_)
+        rows.append((name, passed, message))
+    return rows
+
+
+def _validate_worker_map(snapshot, map_, **kwargs):
+    """Validates a mapping file in a `validate_many` worker
+
+    The snapshot is loaded by the first file a worker validates and kept
+    for the rest. (The pool `initializer` argument needs Python 3.7.)
+    """
+    global _worker_dictionary
+    path, dictionary = _worker_dictionary
+    if path != snapshot:
+        dictionary = DataDictionary.load_snapshot(snapshot)
+        _worker_dictionary = (snapshot, dictionary)
+    return _validate_map(dictionary, map_, **kwargs)
+
+
+def _gather(futures, profile=None):
+    """Gets the results of validation futures, in the order submitted
+
+    Profile records are added as each question finishes, rather than in
+    the order submitted.
+    """
+    if profile is not None:
+        for future in as_completed(futures):
+            profile.add(future.result()[2])
+    return [future.result() for future in futures]
+
+
+def _iter_chunks(map_, chunksize=100000, sep=None, **kwargs):
+    """Gets metadata one DataFrame at a time
+
+    `map_` can be a DataFrame, the path to a delimited text file, which is
+    read as strings in chunks, or an iterable of DataFrames.
+    """
+    if isinstance(map_, pd.DataFrame):
+        yield map_
+    elif isinstance(map_, (str, os.PathLike)):
+        if sep is None:
+            sep = _infer_sep(map_)
+        kwargs.setdefault('dtype', str)
+        for chunk in pd.read_csv(map_, sep=sep, chunksize=chunksize,
+                                 **kwargs):
+            yield chunk
+    else:
+        for chunk in map_:
+            yield chunk
+
+
+def _column_position(header, column):
+    """Finds the position of a column given by name or position"""
+    if isinstance(column, (int, np.integer)):
+        return int(column)
+    return list(header).index(column)
+
+
+def _infer_sep(path):
+    """Guesses the delimiter for a mapping file from the file extension"""
+    if str(path).endswith(('.tsv', '.txt')):
+        return '\t'
+    else:
+        return ','
+
+
+def _cast_categories(series, question):
+    """Casts the categories of a column read as text to the question dtype
+
+    Placeholders are kept as text, and categories which are cast to the
+    same value (i.e. `'1'` and `'01'`) are merged. If any category cannot
+    be cast, the column is returned unchanged.
+    """
+    categories = pd.Series(series.cat.categories, dtype=object)
+    values, errors = question._cast_plan(categories,
+                                         question._validator_plan())
+    if errors.any():
+        return series
+    levels = [c if pd.isnull(v) else question.dtype(v)
+              for c, v in zip(categories, values)]
+    inverse, uniques = pd.factorize(pd.Series(levels, dtype=object))
+    codes = series.cat.codes.values
+    codes = np.where(codes < 0, -1, inverse[codes])
+    return pd.Series(pd.Categorical.from_codes(codes, uniques),
+                     index=series.index, name=series.name)
+
+
+def _data_fingerprint(series):
+    """Hashes the contents, index, and dtype of a column"""
+    hash_ = hashlib.sha1(str(series.dtype).encode('utf-8'))
+    hash_.update(pd.util.hash_pandas_object(series, index=True).values)
+    return hash_.hexdigest()
+
+
+def _write_cache(cache, stored):
+    """Replaces the validation cache with the passing fingerprints
+
+    The cache is written to a new temporary file and moved into place, so
+    processes sharing the cache never write to the same file or read a
+    partly written one. The cache only saves time, so it is skipped if it
+    cannot be written.
+    """
+    try:
+        fd_, tmp_ = tempfile.mkstemp(suffix='.tmp',
+                                     dir=os.path.dirname(cache) or '.')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd_, 'w') as f_:
+            json.dump(stored, f_)
+        os.replace(tmp_, cache)
+    except OSError:
+        if os.path.exists(tmp_):
+            os.remove(tmp_)
+
+
+def _merge_log(question, entries):
+    """Adds log entries from a validation worker to the question
+
+    Questions validated in the current process already hold the entries
+    (the last entry matches, down to the nanosecond timestamp), so they are
+    only added when the question was validated in another process.
+    """
+    if (len(entries) > 0) and ((len(question.log) == 0) or
+                               (question.log[-1] != entries[-1])):
+        question.log.extend(entries)
+
+
@@ -0,0 +1,188 @@
+"""
+Times the validation of questions, one phase at a time
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import time
+
+import pandas as pd
+
+# The parts of validation which are timed separately. Placeholders covers
+# finding null values and placeholders, cast covers converting the data to
+# the question dtype, and check covers the limit or order checks.
+phases = ['placeholders', 'cast', 'check']
+
+profile_columns = ['column', 'type', 'rows', 'bytes', 'wall_time'] + \
+    phases + ['passed']
+
+# The timer for the question being validated in each thread. When nothing
+# is being profiled, `phase` hands back the same do-nothing context, so
+# the timing points cost a single lookup.
+_active = threading.local()
+
+
+class _NullContext(object):
+    """A context which does nothing, like `contextlib.nullcontext`
+
+    `contextlib.nullcontext` is only available from Python 3.7.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+_null = _NullContext()
+
+
+class ValidationProfile(object):
+    u"""Collects the time taken to validate each question
+
+    Each record holds the question name (`column`) and type (`type`), the
+    number of rows (`rows`), the memory used by the column in bytes,
+    including the contents of any strings (`bytes`), the wall time in
+    seconds (`wall_time`), the seconds spent in each phase of validation
+    (`placeholders`, `cast`, and `check`), and whether the question passed
+    (`passed`). The phases do not add up to the wall time, which also
+    includes summarizing and logging the results.
+
+    Parameters
+    ----------
+    callbacks : callable, list of callables, optional
+        Functions called with each record (an OrderedDict) as soon as the
+        question has been validated.
+
+    Examples
+    --------
+    A profile can be passed to `DataDictionary.validate`, or used to time
+    a single question
+
+    >>> profile = ValidationProfile()
+    >>> with profile.measure(question, map_):
+    ...     question.validate(map_)
+    >>> profile.to_frame()
+    """
+
+    def __init__(self, callbacks=None):
+        if callbacks is None:
+            callbacks = []
+        elif callable(callbacks):
+            callbacks = [callbacks]
+        self.callbacks = list(callbacks)
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def add(self, record):
+        """Adds a record to the profile and passes it to the callbacks"""
+        self.records.append(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def clear(self):
+        """Removes all the records"""
+        self.records = []
+
+    @contextmanager
+    def measure(self, question, map_):
+        """Times the validation of a question inside a `with` block
+
+        The record is added to the profile when the block exits, even if
+        the question fails validation.
+
+        Parameters
+        ----------
+        question : Question
+            The question being validated
+        map_ : DataFrame
+            The data being validated. The question `name` should be a
+            column in `map_`.
+
+        Yields
+        ------
+        OrderedDict
+            The record for the question, which is filled in when the block
+            exits
+        """
+        record = None
+        try:
+            with _measure(question, map_[question.name]) as record:
+                yield record
+        finally:
+            if record is not None:
+                self.add(record)
+
+    def to_frame(self):
+        """Gets the records as a DataFrame, with one row per question"""
+        return pd.DataFrame(self.records, columns=profile_columns)
+
+
+def phase(name):
+    """Times a phase of validation for the question being profiled
+
+    Parameters
+    ----------
+    name : str
+        The phase being timed, from `phases`
+
+    Returns
+    -------
+    context manager
+        A context which adds the time spent in the `with` block to the
+        phase, or a context which does nothing if no question is being
+        profiled in this thread.
+    """
+    timer = getattr(_active, 'timer', None)
+    if timer is None:
+        return _null
+    return timer.phase(name)
+
+
+class _Timer(object):
+    """Adds the time spent in each phase to a record"""
+
+    def __init__(self, record):
+        self.record = record
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record[name] += time.perf_counter() - start
+
+
+@contextmanager
+def _measure(question, series):
+    """Profiles a question while the `with` block runs in this thread
+
+    This does not need a `ValidationProfile`, so it can be used by workers
+    in other processes, which send the record back.
+    """
+    record = OrderedDict([('column', question.name),
+                          ('type', question.type),
+                          ('rows', len(series)),
+                          ('bytes', 0),
+                          ('wall_time', 0.0)])
+    record.update((name, 0.0) for name in phases)
+    record['passed'] = False
+
+    previous = getattr(_active, 'timer', None)
+    _active.timer = _Timer(record)
+    start = time.perf_counter()
+    try:
+        yield record
+        record['passed'] = True
+    finally:
+        record['wall_time'] = time.perf_counter() - start
+        _active.timer = previous
+        record['bytes'] = int(series.memory_usage(index=False, deep=True))
@@ -0,0 +1,670 @@
+"""
+Stores the provenance logs kept by questions and data dictionaries
+"""
+
+from collections import deque
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import break4w._defaults as b4wdefaults
+
+log_columns = ['timestamp', 'column', 'command', 'transform_type',
+               'transformation']
+
+# Commands which do not change the question or dictionary. These are not
+# recorded when the verbosity is below 2.
+read_only_commands = {'get question', 'Write Log'}
+
+# Logs without entries share these empty arrays, so an unused log does not
+# allocate any. The arrays are replaced, never written to, when a log grows.
+_no_times = np.empty(0, dtype=np.int64)
+_no_codes = np.empty((0, 3), dtype=np.int32)
+_no_text = np.empty(0, dtype=object)
+for _array in (_no_times, _no_codes, _no_text):
+    _array.flags.writeable = False
+del _array
+
+
+class ProvenanceLog(object):
+    u"""A bounded, array-backed record of the actions taken on an object
+
+    Each entry has a timestamp, column, command, transform type, and
+    transformation. The timestamps are kept as integer nanoseconds, the
+    column, command and type as integer codes, and the transformation as
+    text, so an entry is a row in a few arrays rather than a dictionary.
+    Once the log holds `max_entries` entries, the oldest entry is dropped
+    for each new entry.
+
+    Indexing or iterating over the log gives the entries as dictionaries
+    (with a `datetime` timestamp), so the log can be used like the list
+    of dictionaries it replaces.
+
+    Parameters
+    ----------
+    entries : iterable of dicts, optional
+        Entries to add to the log
+    max_entries : int, optional
+        The number of entries to keep. If this is None, the default from
+        `break4w._defaults.log_max_entries` is used. Use 0 to keep every
+        entry.
+    verbosity : int, optional
+        What should be recorded by `record`: 0 records nothing, 1 records
+        everything except read-only commands (i.e. `get question`), and
+        2 records everything. If this is None, the default from
+        `break4w._defaults.log_verbosity` is used.
+    store : JSONLinesStore, SQLiteStore, optional
+        An on-disk store. Every entry added to the log is also written to
+        the store, so entries dropped from the log are kept on disk.
+
+    Notes
+    -----
+    The column names, commands, and transform types are repeated many
+    times, so they are stored as integer codes into a table of labels kept
+    by the log. The arrays, labels and indexes are only created when the
+    first entry is added, since most logs stay small or empty.
+    """
+
+    __slots__ = ('max_entries', 'verbosity', 'store', 'recorded', '_times',
+                 '_codes', '_text', '_start', '_size', '_labels',
+                 '_label_codes', '_index')
+
+    def __init__(self, entries=None, max_entries=None, verbosity=None,
+        store=None):
+        if max_entries is None:
+            max_entries = b4wdefaults.log_max_entries
+        if verbosity is None:
+            verbosity = b4wdefaults.log_verbosity
+        self.max_entries = max_entries
+        self.verbosity = verbosity
+        self.store = store
+
+        self._times = _no_times
+        self._codes = _no_codes
+        self._text = _no_text
+        self._start = 0
+        self._size = 0
+        # The number of entries ever added, including any which have been
+        # dropped
+        self.recorded = 0
+        # The labels for each code, and the code for each label
+        self._labels = None
+        self._label_codes = None
+        # The sequence numbers (i.e. the value of `recorded` when the entry
+        # was added) of the entries for each column and command code
+        self._index = None
+
+        if entries is not None:
+            self.extend(entries)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._entries(self._positions()[key])
+        if key < 0:
+            key += self._size
+        if not (0 <= key < self._size):
+            raise IndexError('log index out of range')
+        return self._entry(key)
+
+    def __iter__(self):
+        return iter(self._entries(self._positions()))
+
+    def __eq__(self, other):
+        if isinstance(other, (ProvenanceLog, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return ('ProvenanceLog(%i entries, max_entries=%i, verbosity=%i)'
+                % (self._size, self.max_entries, self.verbosity))
+
+    def __getstate__(self):
+        u"""Stores the labels rather than the codes, which are per-process
+
+        The store is not kept, since it holds an open file.
+        """
+        return {'max_entries': self.max_entries,
+                'verbosity': self.verbosity,
+                'entries': [(self._times[i],) + self._row(i)
+                            for i in self._positions()],
+                }
+
+    def __setstate__(self, state):
+        self.__init__(max_entries=state['max_entries'],
+                      verbosity=state['verbosity'])
+        for (time_, column, command, transform_type, transformation) \
+                in state['entries']:
+            self._add(time_, column, command, transform_type, transformation,
+                      write=False)
+
+    def record(self, command, column=None, transform_type=None,
+        transformation=None):
+        u"""Adds an entry for an action, if the verbosity allows it
+
+        Parameters
+        ----------
+        command : str
+            A short textual description of the command performed.
+        column: str, optional
+            The column the command acted on
+        transform_type: str, optional
+            A more general description of the type of action that was
+            performed.
+        transformation: str, optional
+            Explains exactly how values were changed.
+        """
+        if (self.verbosity < 1) or ((self.verbosity < 2) and
+                                    (command in read_only_commands)):
+            return
+        self._add(_now_ns(), column, command, transform_type,
+                  transformation)
+
+    def append(self, entry):
+        u"""Adds an entry given as a dictionary
+
+        Anything else (i.e. a note passed as text) is added as the
+        transformation of an entry with the current time.
+        """
+        if not isinstance(entry, dict):
+            self._add(_now_ns(), None, None, None, entry)
+            return
+        self._add(_to_ns(entry['timestamp']), entry.get('column'),
+                  entry.get('command'), entry.get('transform_type'),
+                  entry.get('transformation'))
+
+    def extend(self, entries):
+        u"""Adds several entries (see `append`)"""
+        for entry in entries:
+            self.append(entry)
+
+    def query(self, column=None, command=None, transform_type=None,
+        since=None):
+        u"""Finds the entries matching all of the filters
+
+        The entries for a column or command are looked up in an index, so
+        only those entries are checked against the other filters.
+
+        Parameters
+        ----------
+        column : str, optional
+            Only returns entries for this column
+        command : str, optional
+            Only returns entries for this command
+        transform_type : str, optional
+            Only returns entries with this transform type
+        since : datetime, optional
+            Only returns entries from this time onwards
+
+        Returns
+        -------
+        list of dicts
+            The matching entries, oldest first
+        """
+        if self._index is None:
+            return []
+        oldest = self.recorded - self._size
+        candidates = None
+        for index_, label in zip(self._index, (column, command)):
+            if label is None:
+                continue
+            seqs = index_.get(self._label_codes.get(label), ())
+            if (candidates is None) or (len(seqs) < len(candidates)):
+                candidates = seqs
+        if candidates is None:
+            candidates = range(oldest, self.recorded)
+
+        filters = [(i, self._label_codes.get(label))
+                   for i, label in enumerate((column, command, transform_type))
+                   if label is not None]
+        if any([code is None for i, code in filters]):
+            return []
+        since = None if since is None else _to_ns(since)
+
+        offsets = np.fromiter(candidates, dtype=np.int64,
+                              count=len(candidates)) - oldest
+        offsets = offsets[offsets >= 0]
+        positions = (self._start + offsets) % max(len(self._times), 1)
+        keep = np.ones(len(offsets), dtype=bool)
+        for i, code in filters:
+            keep &= self._codes[positions, i] == code
+        if since is not None:
+            keep &= self._times[positions] >= since
+        return self._entries(positions[keep])
+
+    def since(self, recorded):
+        u"""Gets the entries added after the log had `recorded` entries
+
+        Parameters
+        ----------
+        recorded : int
+            A previous value of `ProvenanceLog.recorded`
+
+        Returns
+        -------
+        list of dicts
+            The entries which were added since then, and are still kept
+        """
+        count = min(self.recorded - recorded, self._size)
+        return self[self._size - count:]
+
+    def load(self, entries):
+        u"""Adds entries without writing them to the store
+
+        This is used for entries which were read from the store, or which
+        another log has already written.
+        """
+        for entry in entries:
+            self._add(_to_ns(entry['timestamp']), entry.get('column'),
+                      entry.get('command'), entry.get('transform_type'),
+                      entry.get('transformation'), write=False)
+
+    def clear(self):
+        u"""Removes every entry, keeping the store"""
+        self.__init__(max_entries=self.max_entries, verbosity=self.verbosity,
+                      store=self.store)
+
+    def to_frame(self):
+        u"""Converts the log to a DataFrame, with one row per entry"""
+        positions = self._positions()
+        codes = self._codes[positions]
+        labels = self._labels
+        return pd.DataFrame(
+            {'timestamp': [_from_ns(t) for t in self._times[positions]],
+             'column': [labels[c] for c in codes[:, 0]],
+             'command': [labels[c] for c in codes[:, 1]],
+             'transform_type': [labels[c] for c in codes[:, 2]],
+             'transformation': list(self._text[positions]),
+             },
+            columns=log_columns,
+            )
+
+    def _positions(self):
+        u"""Gets the array positions of the entries, oldest first"""
+        return (self._start + np.arange(self._size)) % max(len(self._times), 1)
+
+    def _row(self, position):
+        u"""Gets the column, command, type, and transformation at a position
+        """
+        column, command, transform_type = self._codes[position]
+        labels = self._labels
+        return (labels[column], labels[command], labels[transform_type],
+                self._text[position])
+
+    def _entries(self, positions):
+        u"""Gets the entries at several array positions as dictionaries"""
+        labels = self._labels
+        return [{'timestamp': _from_ns(time_),
+                 'column': labels[column],
+                 'command': labels[command],
+                 'transform_type': labels[transform_type],
+                 'transformation': transformation,
+                 }
+                for time_, (column, command, transform_type), transformation
+                in zip(self._times[positions].tolist(),
+                       self._codes[positions].tolist(),
+                       self._text[positions].tolist())]
+
+    def _entry(self, i):
+        u"""Gets the i-th oldest entry as a dictionary"""
+        position = (self._start + i) % len(self._times)
+        column, command, transform_type, transformation = \
+            self._row(position)
+        return {'timestamp': _from_ns(self._times[position]),
+                'column': column,
+                'command': command,
+                'transform_type': transform_type,
+                'transformation': transformation,
+                }
+
+    def _add(self, time_, column, command, transform_type, transformation,
+        write=True):
+        u"""Writes an entry, growing the arrays or dropping the oldest entry
+        """
+        if write and (self.store is not None):
+            self.store.write((int(time_), column, command, transform_type,
+                              transformation))
+
+        capacity = len(self._times)
+        if self._size == capacity:
+            if (self.max_entries > 0) and (capacity >= self.max_entries):
+                # The log is full, so the oldest entry is replaced
+                position = self._start
+                self._drop(position)
+                self._start = (self._start + 1) % capacity
+                self._size -= 1
+            else:
+                self._grow()
+                position = self._size
+        else:
+            position = (self._start + self._size) % capacity
+
+        if self._index is None:
+            self._labels = [None]
+            self._label_codes = {None: 0}
+            self._index = ({}, {})
+        codes = (self._code(column), self._code(command),
+                 self._code(transform_type))
+        self._times[position] = time_
+        self._codes[position] = codes
+        self._text[position] = transformation
+        self._size += 1
+        self.recorded += 1
+
+        for index_, code in zip(self._index, codes):
+            seqs = index_.get(code)
+            if seqs is None:
+                seqs = index_[code] = deque()
+            seqs.append(self.recorded - 1)
+
+    def _drop(self, position):
+        u"""Removes the oldest entry, at `position`, from the indexes
+
+        The entry is the oldest in its column and command buckets, so it is
+        the first sequence number in each. Empty buckets are removed.
+        """
+        for index_, code in zip(self._index, self._codes[position, :2]):
+            code = int(code)
+            seqs = index_[code]
+            seqs.popleft()
+            if not seqs:
+                del index_[code]
+
+    def _code(self, label):
+        u"""Gets the integer code for a label, adding it to the table"""
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self._labels)
+            self._labels.append(label)
+        return code
+
+    def _grow(self):
+        u"""Doubles the space in the arrays, up to `max_entries`"""
+        capacity = max(8, 2 * len(self._times))
+        if self.max_entries > 0:
+            capacity = min(capacity, self.max_entries)
+        positions = self._positions()
+
+        times = np.empty(capacity, dtype=np.int64)
+        codes = np.empty((capacity, 3), dtype=np.int32)
+        text = np.empty(capacity, dtype=object)
+        times[:self._size] = self._times[positions]
+        codes[:self._size] = self._codes[positions]
+        text[:self._size] = self._text[positions]
+
+        self._times, self._codes, self._text = times, codes, text
+        self._start = 0
+
+
+class _BufferedStore(object):
+    u"""Buffers entries in memory and appends them to a file in batches
+
+    Child classes write the batches and read the entries back. Any queued
+    entries are written when the store is closed, garbage collected, or
+    when the interpreter exits.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        # The finalizer holds the buffer and where it is written, but not
+        # the store, so the store can still be garbage collected
+        self._finalizer = weakref.finalize(self, _write_buffer,
+                                           self._write_rows, self._sink(),
+                                           self._buffer)
+
+    def write(self, row):
+        u"""Queues an entry, given as a (nanosecond timestamp, column,
+        command, transform type, transformation) tuple
+        """
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        u"""Writes any queued entries"""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        u"""Writes any queued entries and closes the store"""
+        with self._lock:
+            self._finalizer()
+
+    def read(self, column=None, command=None, since=None, until=None):
+        u"""Reads the entries in the store, one at a time
+
+        Any queued entries are written first.
+
+        Parameters
+        ----------
+        column : str, optional
+            Only returns entries for this column
+        command : str, optional
+            Only returns entries for this command
+        since, until : datetime, int, optional
+            Only returns entries from this time onwards, or before this time.
+            Integers are treated as nanoseconds since the epoch.
+
+        Returns
+        -------
+        generator of dicts
+            The entries, in the order they were written
+        """
+        self.flush()
+        since = None if since is None else _to_ns(since)
+        until = None if until is None else _to_ns(until)
+        for (time_, column_, command_, transform_type, transformation) \
+                in self._read_rows(column, command, since, until):
+            yield {'timestamp': _from_ns(time_),
+                   'column': column_,
+                   'command': command_,
+                   'transform_type': transform_type,
+                   'transformation': transformation,
+                   }
+
+    def _flush(self):
+        _write_buffer(self._write_rows, self._sink(), self._buffer)
+
+
+class JSONLinesStore(_BufferedStore):
+    u"""An append-only store with one JSON object per line
+
+    Parameters
+    ----------
+    path : str
+        The file to append the entries to
+    batch_size : int, optional
+        The number of entries held in memory before they are written
+    """
+
+    def _sink(self):
+        return self.path
+
+    @staticmethod
+    def _write_rows(path, rows):
+        lines = [json.dumps(dict(zip(log_columns, row)), default=str)
+                 for row in rows]
+        with open(path, 'a') as f_:
+            f_.write('\n'.join(lines) + '\n')
+
+    def _read_rows(self, column, command, since, until):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f_:
+            for line in f_:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if (((column is not None) and (entry['column'] != column)) or
+                    ((command is not None) and 
+                     (entry['command'] != command)) or
+                    ((since is not None) and (entry['timestamp'] < since)) or
+                    ((until is not None) and (entry['timestamp'] >= until))):
+                    continue
+                yield tuple(entry[k] for k in log_columns)
+
+
+class SQLiteStore(_BufferedStore):
+    u"""An append-only store in a local SQLite database
+
+    The entries are kept in a `provenance` table, indexed on the column,
+    command, and timestamp.
+
+    Parameters
+    ----------
+    path : str
+        The database file
+    batch_size : int, optional
+        The number of entries held in memory before they are written
+    """
+
+    def __init__(self, path, batch_size=1000):
+        # Validation threads may write to the log, so the connection is
+        # shared between threads (with access guarded by the lock)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS provenance (timestamp INTEGER, '
+                '"column" TEXT, command TEXT, transform_type TEXT, '
+                'transformation TEXT)')
+            for index_ in ['"column"', 'command', 'timestamp']:
+                self._connection.execute(
+                    'CREATE INDEX IF NOT EXISTS provenance_%s ON provenance '
+                    '(%s)' % (index_.strip('"'), index_))
+        _BufferedStore.__init__(self, path, batch_size=batch_size)
+
+    def close(self):
+        _BufferedStore.close(self)
+        self._connection.close()
+
+    def _sink(self):
+        return self._connection
+
+    @staticmethod
+    def _write_rows(connection, rows):
+        with connection:
+            connection.executemany(
+                'INSERT INTO provenance VALUES (?, ?, ?, ?, ?)', 
+                [row[:4] + (_to_text(row[4]),) for row in rows])
+
+    def _read_rows(self, column, command, since, until):
+        where = []
+        params = []
+        for clause, value in [('"column" = ?', column), 
+                              ('command = ?', command),
+                              ('timestamp >= ?', since),
+                              ('timestamp < ?', until)]:
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        query = 'SELECT * FROM provenance'
+        if where:
+            query = '%s WHERE %s' % (query, ' AND '.join(where))
+        with self._lock:
+            cursor = self._connection.execute(query + ' ORDER BY rowid',
+                                              params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+
+
+def open_store(path, batch_size=1000):
+    u"""Opens an on-disk provenance store
+
+    Files ending in `.db`, `.sqlite` or `.sqlite3` are opened as SQLite
+    databases, and all other files are opened as JSON Lines.
+
+    Parameters
+    ----------
+    path : str
+        The file for the store
+    batch_size : int, optional
+        The number of entries held in memory before they are written
+
+    Returns
+    -------
+    JSONLinesStore, SQLiteStore
+    """
+    if os.path.splitext(path)[1].lower() in {'.db', '.sqlite', '.sqlite3'}:
+        return SQLiteStore(path, batch_size=batch_size)
+    return JSONLinesStore(path, batch_size=batch_size)
+
+
+def attach_store(log, store):
+    u"""Streams a log to a store, starting with the entries it already has
+
+    Parameters
+    ----------
+    log : ProvenanceLog
+        The log to be written
+    store : JSONLinesStore, SQLiteStore
+        The store for the entries
+    """
+    if log.store is store:
+        return
+    for entry in log:
+        store.write((_to_ns(entry['timestamp']), entry['column'],
+                     entry['command'], entry['transform_type'],
+                     entry['transformation']))
+    log.store = store
+
+
+def _write_buffer(write_rows, sink, buffer_):
+    u"""Writes and empties the entries queued by a store
+
+    This does not use the store, so it can be called by the finalizer once
+    the store has been garbage collected.
+    """
+    if buffer_:
+        write_rows(sink, buffer_)
+        del buffer_[:]
+
+
+def _to_text(value):
+    if (value is None) or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _now_ns():
+    u"""Gets the current time in integer nanoseconds since the epoch
+
+    `time.time_ns` is only available from Python 3.7. Earlier versions
+    use `time.time`, which is precise to about a microsecond.
+    """
+    time_ns = getattr(time, 'time_ns', None)
+    if time_ns is not None:
+        return time_ns()
+    return int(time.time() * 10**6) * 1000
+
+
+def _to_ns(timestamp):
+    u"""Converts a local datetime to integer nanoseconds since the epoch"""
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    seconds = int(timestamp.replace(microsecond=0).timestamp())
+    return seconds * 10**9 + timestamp.microsecond * 1000
+
+
+def _from_ns(timestamp):
+    u"""Converts integer nanoseconds since the epoch to a local datetime"""
+    seconds, nanoseconds = divmod(int(timestamp), 10**9)
+    return datetime.datetime.fromtimestamp(seconds).replace(
+        microsecond=nanoseconds // 1000)
@@ -1,13 +1,24 @@
-import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+import copy
+import hashlib
 from functools import partial
 import inspect
+import numbers
 import pydoc
+import threading
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
 
+from pandas.api.types import CategoricalDtype
+
 import break4w._defaults as b4wdefaults
+from break4w.profiling import phase
+from break4w.provenance import ProvenanceLog, attach_store, open_store
 
+error_columns = ['column', 'index', 'value', 'rule']
 
 class Question:
     u"""A base object class for handling Data dictionary entries
@@ -120,11 +131,11 @@ class Question:
         self.mimarks = mimarks
         self.ontology = ontology
         if missing is None:
-            self.missing = self.ebi_null
+            self.missing = _intern(self.ebi_null, set, default=self.ebi_null)
         elif isinstance(missing, str):
-            self.missing = set([missing])
+            self.missing = _intern([missing], set)
         else:
-            self.missing = set(missing)
+            self.missing = _intern(missing, set)
         self.blanks = blanks
         self.colormap = _check_cmap(colormap)
         self.original_name = original_name
@@ -143,7 +154,7 @@ class Question:
         for k, v in other_properties.items():
             setattr(self, k, v)
 
-        self.log = []
+        self.log = ProvenanceLog()
 
     def __str__(self):
         u"""Prints a nice summary of the object"""
@@ -159,6 +170,281 @@ class Question:
             'description': self.description,
             })
 
+    def __setattr__(self, name, value):
+        u"""Sets an attribute, clearing the compiled validator if needed"""
+        if not name.startswith('_'):
+            self.__dict__.pop('_plan', None)
+            self.__dict__.pop('_definition', None)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        u"""Drops the compiled validator, which cannot be pickled"""
+        state = self.__dict__.copy()
+        state.pop('_plan', None)
+        return state
+
+    def _validator_plan(self):
+        u"""Gets the compiled settings used to validate the question
+
+        The plan is built the first time it is requested and then cached on
+        the object, so repeated validation does not rebuild the placeholders,
+        remap function, order, or messages. Setting any public attribute
+        (including through `DataDictionary.update_question` or
+        `Categorical._update_order`) clears the cached plan.
+
+        Returns
+        -------
+        mappingproxy
+            A read-only dictionary of the validation settings
+        """
+        plan = self.__dict__.get('_plan')
+        if plan is None:
+            plan = MappingProxyType(self._compile_plan())
+            object.__setattr__(self, '_plan', plan)
+        return plan
+
+    def _snapshot_state(self, log=True):
+        u"""Gets the attributes and compiled validator for a snapshot
+
+        Parameters
+        ----------
+        log : bool, optional
+            Whether the question log should be kept
+
+        Returns
+        -------
+        dict
+            The question attributes
+        dict
+            The compiled validator settings, without the remap function,
+            which cannot be pickled and is rebuilt by `_from_snapshot`
+        """
+        state = self.__getstate__()
+        if not log:
+            state['log'] = ProvenanceLog(max_entries=self.log.max_entries,
+                                         verbosity=self.log.verbosity)
+        plan = dict(self._validator_plan())
+        plan.pop('remap')
+        return state, plan
+
+    @classmethod
+    def _from_snapshot(cls, state, plan=None):
+        u"""Rebuilds a question from `_snapshot_state` without re-parsing it
+        """
+        question = cls.__new__(cls)
+        question.__dict__.update(state)
+        if plan is not None:
+            plan = dict(plan)
+            plan['remap'] = question._identify_remap_function(
+                dtype=question.dtype,
+                placeholders=plan['placeholders'],
+                true_values=question.true_values,
+                false_values=question.false_values,
+                )
+            object.__setattr__(question, '_plan', MappingProxyType(plan))
+        return question
+
+    def _definition_fingerprint(self):
+        u"""Gets a hash of the question definition
+
+        Sets and dictionaries are sorted before they are hashed, so the
+        hash is the same in every process. Like the validator plan, it is
+        cached and cleared when a public attribute is set.
+
+        Returns
+        -------
+        str
+            A hexadecimal hash of the question definition
+        """
+        def _canonical(v):
+            if isinstance(v, (set, frozenset)):
+                return sorted([_canonical(x) for x in v], key=repr)
+            elif isinstance(v, dict):
+                return sorted([(_canonical(k), _canonical(x))
+                               for k, x in v.items()], key=repr)
+            elif isinstance(v, (list, tuple)):
+                return [_canonical(x) for x in v]
+            else:
+                return repr(v)
+
+        definition = self.__dict__.get('_definition')
+        if definition is None:
+            text = repr(sorted([(k, _canonical(v))
+                                for k, v in self.__dict__.items()
+                                if not ((k == 'log') or k.startswith('_'))]))
+            definition = hashlib.sha1(text.encode('utf-8')).hexdigest()
+            object.__setattr__(self, '_definition', definition)
+        return definition
+
+    def _compile_plan(self):
+        u"""Builds the settings used to validate the question
+
+        Child classes should extend the dictionary with any settings they
+        need for validation.
+        """
+        def _to_set(x):
+            if x is None:
+                return set([])
+            elif isinstance(x, str):
+                return set([x])
+            else:
+                return set(x)
+
+        placeholders = _to_set(self.missing).union(
+            _to_set(self.blanks),
+            _to_set(getattr(self, 'ambiguous', None)),
+            )
+        dtype_str = str(self.dtype).replace("<class '", '').replace("'>", '')
+
+        return {'placeholders': frozenset(placeholders),
+                'true_values': frozenset(self.true_values),
+                'false_values': frozenset(self.false_values),
+                'remap': self._identify_remap_function(
+                    dtype=self.dtype,
+                    placeholders=placeholders,
+                    true_values=self.true_values,
+                    false_values=self.false_values,
+                    ),
+                'cast_error': 'the data cannot be cast to %s' % dtype_str,
+                'cast_pass': 'the data can be cast to %s' % dtype_str,
+                }
+
+    def _cast_plan(self, series, plan):
+        u"""Casts a column using the settings in the compiled plan"""
+        return self._cast_series(series,
+                                 dtype=self.dtype,
+                                 placeholders=plan['placeholders'],
+                                 true_values=plan['true_values'],
+                                 false_values=plan['false_values'],
+                                 )
+
+    def _summarize(self, series):
+        u"""Summarizes a column, or part of a column, for validation
+
+        Summaries from different parts of the same column can be combined
+        with `_merge_summaries` and then checked with `_check_summary`, so
+        a column never has to be held in memory all at once.
+
+        Parameters
+        ----------
+        series : Series
+            The data to be summarized.
+
+        Returns
+        -------
+        dict
+            The number of rows (`'rows'`), the number of values which
+            cannot be cast to the dtype (`'cast_errors'`), and the unique
+            values which cannot be cast (`'error_values'`).
+        """
+        return self._cast_summary(series)[1]
+
+    def _cast_summary(self, series):
+        u"""Casts a column and summarizes the values which could not be cast
+
+        Returns
+        -------
+        Series
+            The cast data, as returned by `_cast_series`
+        dict
+            The summary of the cast, as returned by `_summarize`.
+        """
+        values, errors = self._cast_plan(series, self._validator_plan())
+        with phase('cast'):
+            errors = errors.values
+            summary = {'rows': len(series),
+                       'cast_errors': int(errors.sum()),
+                       'error_values': np.asarray(
+                            pd.unique(series.values[errors]), dtype=object
+                            ),
+                       }
+        return values, summary
+
+    @staticmethod
+    def _merge_summaries(left, right):
+        u"""Combines two validation summaries of the same column
+
+        Counts are added, unique values are combined, and minimum and
+        maximum values ignore null values. Either summary may be None.
+        """
+        if left is None:
+            return right
+        elif right is None:
+            return left
+
+        merged = {}
+        for key, value in left.items():
+            if key == 'min':
+                merged[key] = np.fmin(value, right[key])
+            elif key == 'max':
+                merged[key] = np.fmax(value, right[key])
+            elif isinstance(value, np.ndarray):
+                merged[key] = pd.unique(np.concatenate([
+                    np.asarray(value, dtype=object),
+                    np.asarray(right[key], dtype=object)
+                    ]))
+            else:
+                merged[key] = value + right[key]
+        return merged
+
+    def _check_summary(self, summary):
+        u"""Checks a validation summary can be cast, and logs the result
+
+        Raises
+        ------
+        TypeError
+            If any of the data cannot be cast to the dtype
+        """
+        plan = self._validator_plan()
+        if summary['cast_errors'] > 0:
+            self._update_log('validate', 'error', plan['cast_error'])
+            raise TypeError(plan['cast_error'])
+        else:
+            self._update_log('validate', 'pass', plan['cast_pass'])
+
+    def _error_masks(self, series):
+        u"""Finds the rows in a column which break each validation rule
+
+        Returns
+        -------
+        Series
+            The cast data, as returned by `_cast_series`
+        OrderedDict
+            A boolean array for each rule which is True where the value
+            breaks the rule. The base question only checks the cast
+            (`'cast'`).
+        """
+        values, errors = self._cast_plan(series, self._validator_plan())
+        return values, OrderedDict([('cast', errors.values)])
+
+    def _find_errors(self, series):
+        u"""Lists every value in a column which fails validation
+
+        Unlike `validate`, this does not stop at the first problem or raise
+        an error.
+
+        Parameters
+        ----------
+        series : Series
+            The data to be checked.
+
+        Returns
+        -------
+        DataFrame
+            The question name (`column`), the row index (`index`), the
+            value (`value`), and the rule it broke (`rule`) for each error.
+        """
+        values, masks = self._error_masks(series)
+        tables = [pd.DataFrame({'column': self.name,
+                                'index': series.index[mask],
+                                'value': series.values[mask],
+                                'rule': rule},
+                               columns=error_columns)
+                  for rule, mask in masks.items() if mask.any()]
+        if len(tables) == 0:
+            return pd.DataFrame(columns=error_columns)
+        return pd.concat(tables, ignore_index=True)
+
     def _update_log(self, command, transform_type, transformation):
         u"""A helper function to update the in-object documentation object
 
@@ -181,17 +467,23 @@ class Question:
             Explains exactly how values were changed.
 
         """
-        self.log.append({
-            'timestamp': datetime.datetime.now(),
-            'column': self.name,
-            'command': command,
-            'transform_type': transform_type,
-            'transformation': transformation,
-            })
-    
-    def write_provenance(self):
+        self.log.record(command, column=self.name,
+                        transform_type=transform_type,
+                        transformation=transformation)
+
+    def write_provenance(self, fp_=None, batch_size=1000):
         """Writes the question provenance to a string
 
+        Parameters
+        ----------
+        fp_ : str, optional
+            An append-only file (JSON Lines, or SQLite if the file ends in
+            `.db`, `.sqlite`, or `.sqlite3`) for the provenance. The current
+            log is added to the file, and all later entries are written to
+            it in batches of `batch_size`.
+        batch_size : int, optional
+            The number of entries held in memory before they are written
+
         Returns
         -------
         DataFrame
@@ -199,17 +491,35 @@ class Question:
             action type, and changes in the data.
         """
         self._update_log('Write Log', 'recording', '')
-        return pd.DataFrame(self.log)[['timestamp', 'command', 'column',
-                                       'transform_type', 'transformation']]
+        if fp_ is not None:
+            attach_store(self.log, _get_store(self.log, fp_, batch_size))
+        return self.log.to_frame()[['timestamp', 'command', 'column',
+                                    'transform_type', 'transformation']]
 
-    def _read_provenance(self, fp_):
+    def _read_provenance(self, fp_, command=None, since=None, until=None):
         """
         Reads the existing question provenance
 
-        to be added!
+        The log is replaced with the entries for the question in a file
+        written by `write_provenance`. The file is read one entry at a time,
+        so only the entries the log keeps are held in memory.
+
+        Parameters
+        ----------
+        fp_ : str
+            The provenance file
+        command : str, optional
+            Only reads entries for this command
+        since, until : datetime, optional
+            Only reads entries from this time onwards, or before this time
 
         """
-        raise NotImplementedError
+        store = _get_store(self.log, fp_)
+        self.log.clear()
+        self.log.load(store.read(column=self.name, command=command,
+                                 since=since, until=until))
+        if store is not self.log.store:
+            store.close()
 
     def _check_ontology(self):
         """
@@ -230,10 +540,10 @@ class Question:
                 return null_value
             else:
                 return var_str % x
-        if (isinstance(val_, (list, set, tuple, np.ndarray, dict)) and 
-             len(val_) == 0):
+        if (isinstance(val_, (list, set, frozenset, tuple, np.ndarray, dict))
+             and len(val_) == 0):
             return null_value
-        if isinstance(val_, (list, set, tuple, np.ndarray)):
+        if isinstance(val_, (list, set, frozenset, tuple, np.ndarray)):
             return var_delim.join([_to_str(v) for v in val_])
         elif isinstance(val_, dict):
             return var_delim.join([
@@ -274,14 +584,23 @@ class Question:
     def _to_series(self, code_delim='=', var_delim=' | ', 
         var_str=None, code_str='%s', null_value='None'):
         """Formats data as a series of text values"""
+        return pd.Series(self._to_dict(code_delim=code_delim, 
+                                       var_delim=var_delim, var_str=var_str,
+                                       code_str=code_str, 
+                                       null_value=null_value))
+
+    def _to_dict(self, code_delim='=', var_delim=' | ', 
+        var_str=None, code_str='%s', null_value='None'):
+        """Formats data as a dictionary of text values"""
 
         tent_dict = self.__dict__.items()
 
         def _check_dict(k, v):
-            if k in {'log'}:
+            if (k in {'log'}) or k.startswith('_'):
                 return False
             elif ((v is None) or 
-                (isinstance(v, (list, set, dict)) and (len(v) == 0))):
+                (isinstance(v, (list, tuple, set, frozenset, dict)) and
+                 (len(v) == 0))):
                 return False
             elif ((k in self.defaults) and (self.defaults[k] == v)):
                 return False
@@ -295,8 +614,7 @@ class Question:
                      var_delim=var_delim, var_str=var_str, code_str=code_str, 
                      null_value=null_value)
 
-        return pd.Series({k: f_(v) for k, v in tent_dict 
-                         if _check_dict(k, v)})
+        return {k: f_(v) for k, v in tent_dict if _check_dict(k, v)}
 
     def _to_usgs(self):
         """Converts question object to usgs xml format
@@ -334,40 +652,119 @@ class Question:
         dtype_ = pydoc.locate(var_['dtype'])
         var_['dtype'] = dtype_
 
-        i_param = {'code_delim': code_delim, 
-                    'var_delim': var_delim, 
-                    'null_value': null_value,
-                    'var_type': dtype_}
-
-        def _handle_col(k, v):
-            if pd.isnull(v) or v == str(null_value):
-                return None
-            if k == 'colormap':
-                return _check_cmap(v)
-            elif (k == 'ref_value') and (dtype_ is bool):
-                return pydoc.locate(v.title())
-            elif (k == 'ref_value'):
-                return dtype_(v)
-            elif (k in {'order', 'limits'}) and (dtype_ is bool):
-                s_ = cls._iterable_from_str(
-                    v, return_type=list, code_delim=code_delim, 
-                    var_delim=var_delim, null_value=null_value)
-                return [pydoc.locate(v_.title()) for v_ in s_]
-            elif k in {'order', 'limits'}:
-                return cls._iterable_from_str(v, return_type=list, **i_param)
-            elif k in b4wdefaults.properties_num:
-                return float(v)
-            elif k in b4wdefaults.properties_bin:
-                return pydoc.locate(v.title())
-            elif k in b4wdefaults.properties_set:
-                return cls._iterable_from_str(v, **i_param)
-            else:
-                return v
-
-        dict_ = {k: _handle_col(k, v) for k, v in var_.iteritems()
+        dict_ = {k: cls._read_value(k, v, dtype_, var_delim=var_delim,
+                                    code_delim=code_delim,
+                                    null_value=null_value)
+                 for k, v in var_.iteritems()
                  if (not (pd.isnull(v) or v == str(null_value)) or 
                      not k in {'type', 'dtype'})}
 
+        return cls._from_read_dict(dict_, dtype_)
+
+    @classmethod
+    def _read_frame(cls, df_, var_delim=' | ', code_delim='=',
+        null_value='None'):
+        """
+        Builds question objects from a dataframe, one per row
+
+        The cells are parsed a column at a time, and each distinct value
+        in a column is only parsed once per datatype, so repeated values
+        (i.e. the datatypes, shared orders, or placeholder lists) are not
+        parsed for every question.
+
+        Parameters
+        ----------
+        df_: DataFrame
+            The parameters for each question, with one question per row
+        var_delim: str, optional
+            The seperator between values in the "order" column.
+        code_delim: str, optional
+            The delimiter between a numericly coded categorical variable and
+            the value it maps to.
+
+        Returns
+        -------
+        list
+            The Question objects, in the same order as the rows
+
+        """
+        if 'type' in df_.columns:
+            df_ = df_.drop(columns=['type'])
+
+        locate = {v: pydoc.locate(v) if isinstance(v, str) else None
+                  for v in pd.unique(df_['dtype'])}
+        dtypes = [locate[v] for v in df_['dtype'].values]
+
+        columns = []
+        for k in df_.columns:
+            values = df_[k].values
+            nulls = pd.isnull(values)
+            # Mirrors the behavior of `_read_series` after `dropna`
+            keep = ~nulls
+            if k == 'dtype':
+                parsed = [locate[v] if use_ else None
+                          for v, use_ in zip(values, keep)]
+                keep = np.array([v is not None for v in parsed], dtype=bool)
+                columns.append((k, keep, parsed))
+                continue
+
+            lookup = {}
+            parsed = []
+            for v, dtype_, use_ in zip(values, dtypes, keep):
+                if not use_:
+                    parsed.append(None)
+                    continue
+                key_ = (v, dtype_)
+                if key_ not in lookup:
+                    lookup[key_] = cls._read_value(
+                        k, v, dtype_, var_delim=var_delim,
+                        code_delim=code_delim, null_value=null_value)
+                parsed.append(copy.copy(lookup[key_]))
+            columns.append((k, keep, parsed))
+
+        return [cls._from_read_dict({k: parsed[i] 
+                                     for (k, keep, parsed) in columns
+                                     if keep[i]},
+                                    dtypes[i])
+                for i in range(len(dtypes))]
+
+    @staticmethod
+    def _read_value(k, v, dtype_, var_delim=' | ', code_delim='=',
+        null_value='None'):
+        """Parses a single text value describing a question parameter"""
+        if pd.isnull(v) or v == str(null_value):
+            return None
+        if k == 'dtype':
+            return dtype_
+        if k == 'colormap':
+            return _check_cmap(v)
+        elif (k == 'ref_value') and (dtype_ is bool):
+            return pydoc.locate(v.title())
+        elif (k == 'ref_value'):
+            return dtype_(v)
+        elif (k in {'order', 'limits'}) and (dtype_ is bool):
+            s_ = Question._iterable_from_str(
+                v, return_type=list, code_delim=code_delim, 
+                var_delim=var_delim, null_value=null_value)
+            return [pydoc.locate(v_.title()) for v_ in s_]
+        elif k in {'order', 'limits'}:
+            return Question._iterable_from_str(
+                v, return_type=list, code_delim=code_delim,
+                var_delim=var_delim, null_value=null_value, var_type=dtype_)
+        elif k in b4wdefaults.properties_num:
+            return float(v)
+        elif k in b4wdefaults.properties_bin:
+            return pydoc.locate(v.title())
+        elif k in b4wdefaults.properties_set:
+            return Question._iterable_from_str(
+                v, code_delim=code_delim, var_delim=var_delim,
+                null_value=null_value, var_type=dtype_)
+        else:
+            return v
+
+    @classmethod
+    def _from_read_dict(cls, dict_, dtype_):
+        """Builds a question from the parsed parameters"""
         if ('order' in dict_) and isinstance(dict_['order'], dict):
             part_ = dict_['order']
             dict_['order'] = [dtype_(k) for k in part_.keys()] 
@@ -436,6 +833,320 @@ class Question:
 
         return remap_
 
+    @classmethod
+    def _cast_series(cls, series, dtype, placeholders=None,
+        true_values=true_values, false_values=false_values):
+        """
+        Converts a column of data to dtype in a single pass over the column
+
+        This follows the same rules as the function returned by
+        `_identify_remap_function`, but works on the whole column. Null
+        values and placeholders are found with a hash lookup, numeric data is
+        cast with `pd.to_numeric`, and strings are cast with `astype`. The
+        small number of values which cannot be handled in bulk (i.e. `'1_0'`
+        or `1.5` for integers) fall back to the element-wise function,
+        applied once per unique value. Columns with a pandas categorical
+        dtype are cast one category at a time. Columns which are already
+        numeric (i.e. read from parquet) are cast to float directly, unless
+        one of the placeholders is a number.
+
+        Parameters
+        ----------
+        series : Series
+            The data to be converted
+        dtype : object
+            The datatype in which the responses should be represented. (i.e.
+            `float`, `int`, `str`).
+        placeholders : set, optional
+            Acceptable values to be ignored representing either placeholder
+            values such as text for missing values, blanks, or ambigious
+            measurements.
+        true_values : set, optional
+            Acceptable values for true values for boolean data
+        false_values : set, optional
+            Acceptable values for false values for boolean data
+
+        Returns
+        -------
+        Series
+            The data cast to `dtype`. Numeric data is returned as floats
+            so null values can be represented. Placeholders, null values,
+            and values which cannot be cast are returned as null.
+        Series
+            A boolean mask which is True where the value cannot be cast
+            to `dtype`.
+        """
+        if placeholders is None:
+            placeholders = set([])
+
+        if (dtype is bool) and _is_boolean_like(series, true_values,
+                                                false_values):
+            with phase('cast'):
+                return (pd.Series(series.values == 1, index=series.index,
+                                  name=series.name).astype(object),
+                        pd.Series(False, index=series.index,
+                                  name=series.name))
+
+        if isinstance(series.dtype, CategoricalDtype):
+            # Casts each category once and expands them using the codes.
+            # The extra value at the end is used for null values (code -1).
+            cvalues, cerrors = cls._cast_series(
+                pd.Series(series.cat.categories), dtype, placeholders,
+                true_values=true_values, false_values=false_values,
+                )
+            with phase('cast'):
+                codes = series.cat.codes.values
+                values = np.append(cvalues.values, np.nan)[codes]
+                errors = np.append(cerrors.values, False)[codes]
+                return (pd.Series(values, index=series.index,
+                                  name=series.name),
+                        pd.Series(errors, index=series.index,
+                                  name=series.name))
+
+        typed = _cast_typed(series, dtype, placeholders)
+        if typed is not None:
+            with phase('cast'):
+                return (pd.Series(typed[0], index=series.index,
+                                  name=series.name),
+                        pd.Series(typed[1], index=series.index,
+                                  name=series.name))
+
+        with phase('placeholders'):
+            ignore = series.isnull().values
+            if len(placeholders) > 0:
+                ignore = ignore | series.isin(list(placeholders)).values
+            to_cast = series[~ignore]
+
+        with phase('cast'):
+            if dtype in {int, float}:
+                cast, errors = _cast_numeric(to_cast, dtype)
+                values = np.full(len(series), np.nan)
+            elif dtype is str:
+                cast = to_cast.astype(str).values
+                errors = np.zeros(len(to_cast), dtype=bool)
+                values = np.full(len(series), np.nan, dtype=object)
+            elif dtype is bool:
+                lookup = _bool_lookup(true_values, false_values)
+                cast, errors = _cast_bool(to_cast, lookup)
+                values = np.full(len(series), np.nan, dtype=object)
+            else:
+                remap_ = cls._identify_remap_function(
+                    dtype, true_values=true_values,
+                    false_values=false_values,
+                    )
+                cast, errors = _cast_unique(to_cast, remap_)
+                values = np.full(len(series), np.nan, dtype=object)
+
+            values[~ignore] = cast
+            error_mask = np.zeros(len(series), dtype=bool)
+            error_mask[~ignore] = errors
+            values[error_mask] = np.nan
+
+            return (pd.Series(values, index=series.index, name=series.name),
+                    pd.Series(error_mask, index=series.index,
+                              name=series.name))
+
+
+def _cast_typed(series, dtype, placeholders):
+    """Casts a numeric numpy column to int or float without checking values
+
+    Null values are the only placeholders a numeric column can hold unless
+    a placeholder is itself a number, so there is nothing to look up. `int`
+    truncates fractions, so the only values which cannot be cast to an
+    integer are infinite.
+
+    Returns
+    -------
+    tuple of arrays or None
+        The cast values and the error mask, or None if the column has to be
+        cast value by value.
+    """
+    if ((dtype not in {int, float}) or
+            (not isinstance(series.dtype, np.dtype)) or
+            (series.dtype.kind not in {'i', 'u', 'f'}) or
+            any(isinstance(p, (numbers.Number, np.number))
+                for p in placeholders)):
+        return None
+
+    values = series.values.astype(float, copy=False)
+    if (dtype is int) and (series.dtype.kind == 'f'):
+        errors = np.isinf(values)
+        values = np.where(errors, np.nan, np.trunc(values))
+    else:
+        errors = np.zeros(len(values), dtype=bool)
+    return values, errors
+
+
+def _cast_numeric(series, dtype):
+    """Casts a series to int or float with `pd.to_numeric`
+
+    Values `pd.to_numeric` cannot resolve with the same answer as `dtype(x)`
+    are passed to the element-wise cast. For integers, this includes
+    fractional values and strings which are not written as integers, since
+    `int('1.0')` fails, but `int(1.5)` does not.
+    """
+    try:
+        cast = pd.to_numeric(series, errors='coerce').values.astype(float)
+    except (TypeError, ValueError):
+        return _cast_unique(series, Question._identify_remap_function(dtype))
+
+    suspect = np.isnan(cast)
+    if dtype is int:
+        with np.errstate(invalid='ignore'):
+            suspect = suspect | (np.mod(cast, 1) != 0)
+        if series.dtype == object:
+            try:
+                int_str = series.str.match(r'^\s*[+-]?\d+\s*$')
+                suspect = suspect | (int_str == False).values
+            except AttributeError:
+                pass
+
+    errors = np.zeros(len(series), dtype=bool)
+    if suspect.any():
+        remap_ = Question._identify_remap_function(dtype)
+        fixed, errors[suspect] = _cast_unique(series[suspect], remap_)
+        cast[suspect] = np.where(errors[suspect], np.nan, fixed)
+
+    return cast, errors
+
+
+def _bool_lookup(true_values, false_values):
+    """Builds a hash table mapping boolean text and codes to True/False
+
+    String values are lower cased, since the data is lower cased before
+    it is looked up.
+    """
+    def _clean(x):
+        if isinstance(x, str):
+            return x.lower()
+        else:
+            return x
+    lookup = {_clean(v): False for v in false_values}
+    lookup.update({_clean(v): True for v in true_values})
+    return lookup
+
+
+def _is_boolean_like(series, true_values, false_values):
+    """Checks if a column is a boolean or 0/1 integer numpy array
+
+    The column can only be compared to 1 if 1 (and True) means True and 0
+    (and False) means False.
+    """
+    if not ((1 in true_values) and (0 in false_values)):
+        return False
+    elif series.dtype == bool:
+        return True
+    elif series.dtype.kind in {'i', 'u'}:
+        values = series.values
+        return bool(((values == 0) | (values == 1)).all())
+    else:
+        return False
+
+
+def _cast_bool(series, lookup):
+    """Maps a series to boolean values using a lookup table
+
+    Strings are lower cased once for the whole column, and then all values
+    are mapped with a single hash lookup. Anything not found in the lookup
+    table is an error.
+    """
+    keys = series
+    if series.dtype == object:
+        try:
+            lowered = series.str.lower()
+            keys = lowered.where(lowered.notnull(), series)
+        except AttributeError:
+            pass
+    cast = keys.map(lookup)
+    errors = cast.isnull().values
+    return cast.values.astype(object), errors
+
+
+def _cast_unique(series, remap_):
+    """Applies an element-wise cast once per unique value in a series"""
+    codes, uniques = pd.factorize(series)
+    remapped = np.empty(len(uniques), dtype=object)
+    remapped[:] = [remap_(u) for u in uniques]
+    is_error = np.array([isinstance(r, str) and (r == 'error')
+                         for r in remapped], dtype=bool)
+    return remapped[codes], is_error[codes]
+
+
+def _get_store(log, fp_, batch_size=1000):
+    """Gets the store a log writes to, or opens a new one for the file"""
+    if (log.store is not None) and (log.store.path == fp_):
+        return log.store
+    return open_store(fp_, batch_size=batch_size)
+
+
+def _intern(values, container, default=None):
+    """Gets a shared copy of a set or list of values
+
+    Questions in a large dictionary often repeat the same placeholders or
+    order. While questions are built in an `_interning` block, equal values
+    are stored once, as a frozenset or tuple, and shared between the
+    questions built in that block. Since the shared values cannot be
+    changed in place, changing one question never changes another (or
+    leaves its validator plan out of date). Outside a block, or for values
+    which cannot be hashed, a new copy is returned.
+
+    Parameters
+    ----------
+    values : iterable
+        The values to be interned
+    container : type
+        `set` or `list`
+    default : set, list, optional
+        The object returned outside an `_interning` block instead of a
+        copy, i.e. the class-wide default placeholders.
+
+    Returns
+    -------
+    set, list, frozenset, tuple
+        The shared copy of the values, as a frozenset or tuple inside an
+        `_interning` block
+    """
+    table = getattr(_interned, 'table', None)
+    if table is None:
+        if default is not None:
+            return default
+        return container(values)
+    # The type is part of the key, since `1`, `1.0` and `True` are equal
+    pairs = [(type(v), v) for v in values]
+    try:
+        if container is set:
+            key = (container, frozenset(pairs))
+            shared = frozenset(values)
+        else:
+            key = (container, tuple(pairs))
+            shared = tuple(values)
+        return table.setdefault(key, shared)
+    except TypeError:
+        return container(values)
+
+
+@contextmanager
+def _interning():
+    """Shares equal placeholders and orders between the questions built in
+    the block
+
+    The table of shared values only lasts as long as the outermost block,
+    so values are not kept after the questions using them are gone.
+    """
+    if getattr(_interned, 'table', None) is not None:
+        yield
+        return
+    _interned.table = {}
+    try:
+        yield
+    finally:
+        _interned.table = None
+
+
+# The values shared by the questions being built in this thread
+_interned = threading.local()
+
+
 def _check_cmap(cmap, num_colors=None, range=None):
     return cmap
 
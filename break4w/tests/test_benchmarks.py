@@ -0,0 +1,79 @@
+from unittest import TestCase, main
+
+import json
+import os
+import tempfile
+
+from break4w.benchmarks.__main__ import main as run_main
+from break4w.benchmarks.scenarios import run_benchmarks
+from break4w.benchmarks.synthetic import (make_columns,
+                                          make_dictionary,
+                                          make_map,
+                                          )
+from break4w.bool import Bool
+from break4w.categorical import Categorical
+from break4w.continous import Continous
+
+
+class SyntheticTest(TestCase):
+
+    def setUp(self):
+        self.d = make_dictionary(12, cardinality=3, seed=1)
+
+    def test_make_columns(self):
+        columns, types = make_columns(30, mix={'bool': 1}, seed=1)
+        self.assertEqual(len(columns), 30)
+        self.assertEqual(set(types), {'bool'})
+        self.assertEqual(columns[0]['name'], 'bool_0')
+
+    def test_make_dictionary(self):
+        self.assertEqual(len(self.d), 12)
+        for question in self.d.values():
+            self.assertTrue(isinstance(question,
+                                       (Bool, Categorical, Continous)))
+            if question.type == 'Categorical':
+                self.assertEqual(list(question.order),
+                                 ['level_0', 'level_1', 'level_2'])
+
+    def test_make_map(self):
+        map_ = make_map(self.d, 200, placeholder_rate=0.1, seed=1)
+        self.assertEqual(map_.shape, (200, 12))
+        self.assertEqual(list(map_.columns), list(self.d.keys()))
+        self.assertTrue((map_ == 'not applicable').any().any())
+        self.d.validate(map_)
+
+    def test_make_map_errors(self):
+        map_ = make_map(self.d, 200, error_rate=0.1, seed=1)
+        with self.assertRaises(ValueError):
+            self.d.validate(map_)
+
+
+class ScenarioTest(TestCase):
+
+    def test_run_benchmarks(self):
+        test = run_benchmarks(rows=[10, 20], n_questions=6, repeat=2)
+        self.assertEqual(
+            [(r['scenario'], r['rows']) for r in test['results']],
+            [('validate', 10), ('validate', 20), ('read_dataframe', None),
+             ('to_dataframe', None), ('add_question', None)])
+        for result in test['results']:
+            self.assertEqual(len(result['times']), 2)
+            self.assertEqual(result['min'], min(result['times']))
+
+    def test_run_benchmarks_error(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks(rows=[10], scenarios=['validate', 'sprint'])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'results.json')
+            run_main(['--rows', '10', '--questions', '3', '--repeat', '1',
+                      '--scenarios', 'validate', '--output', fp_])
+            with open(fp_) as f_:
+                test = json.load(f_)
+        self.assertEqual(len(test['results']), 1)
+        self.assertEqual(test['settings']['n_questions'], 3)
+
+
+if __name__ == '__main__':
+    main()
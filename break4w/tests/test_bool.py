@@ -46,6 +46,74 @@ class BoolTest(TestCase):
     def test_validate_pass(self):
         self.b.validate(self.map_)
 
+    def test_validate_bool_format(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 bool_format=['Y', 'N'],
+                 ambiguous='TBD',
+                 )
+        self.assertTrue('y' in b.true_values)
+        self.assertTrue('n' in b.false_values)
+        self.map_['team_captain'] = ['TBD', 'Y', 'y', 'N']
+        b.validate(self.map_)
+        self.assertEqual(b.log[-1]['transform_type'], 'pass')
+
+    def test_validate_bool_format_error(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 bool_format=['Y', 'N'],
+                 )
+        self.map_['team_captain'] = ['Y', 'N', 'true', 'maybe']
+        with self.assertRaises(TypeError):
+            b.validate(self.map_)
+
+    def test_bool_format_reversed_codes(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 bool_format=[0, 1],
+                 )
+        self.assertTrue(0 in b.true_values)
+        self.assertFalse(1 in b.true_values)
+        self.assertTrue(1 in b.false_values)
+        self.assertFalse(0 in b.false_values)
+        values, errors = b._cast_plan(pd.Series([0, 1]),
+                                      b._validator_plan())
+        self.assertEqual(values.tolist(), [True, False])
+        self.assertFalse(errors.any())
+        self.map_['team_captain'] = [0, 1, 1, 0]
+        b.validate(self.map_)
+
+    def test_bool_format_reversed_numpy_bool(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 bool_format=[0, 1],
+                 )
+        values, errors = b._cast_plan(pd.Series([True, False]),
+                                      b._validator_plan())
+        self.assertEqual(values.tolist(), [False, True])
+        self.assertFalse(errors.any())
+
+    def test_bool_explicit_values(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 true_values={'si', 'true'},
+                 false_values={'no', 'false'},
+                 )
+        self.assertEqual(b.true_values, {'si', 'true'})
+        self.assertEqual(b.false_values, {'no', 'false'})
+        values, errors = b._cast_plan(pd.Series(['si', 'no']),
+                                      b._validator_plan())
+        self.assertEqual(values.tolist(), [True, False])
+        self.assertFalse(errors.any())
+
+    def test_validate_numpy_bool(self):
+        b = Bool(name=self.name,
+                 description=self.description,
+                 )
+        self.map_['team_captain'] = [False, True, True, False]
+        b.validate(self.map_)
+        self.assertEqual(b.log[-1]['transformation'], 'all values were valid')
+
     def test_to_series(self):
         known = pd.Series({'name': self.name,
                            'description': self.description,
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 import numpy.testing as npt
 import pandas.util.testing as pdt
+from pandas.api.types import CategoricalDtype
 
 from break4w.categorical import Categorical
 
@@ -120,6 +121,20 @@ blanks      Lax-Bro
         # Checks the updated order
         self.assertEqual(self.c.order, ["Offense", "Defense"])
 
+    def test_update_order_resets_plan(self):
+        self.assertEqual(self.c._validator_plan()['order'],
+                         ("Striker", "D-man", "Goalie"))
+        self.c._update_order(lambda x: x.lower())
+        self.assertEqual(self.c._validator_plan()['order'],
+                         ("striker", "d-man", "goalie"))
+
+    def test_validate_blanks(self):
+        self.c.blanks = 'Lax-Bro'
+        self.map_.loc['Bitty', 'position'] = 'Lax-Bro'
+        self.c.validate(self.map_)
+        self.assertEqual(self.c.log[1]['transformation'],
+                         'all values were valid')
+
     def test_validate_dtype_fail(self):
         self.c.dtype = bool
         with self.assertRaises(TypeError):
@@ -152,6 +167,70 @@ blanks      Lax-Bro
                          'The following are not valid values: 1 | 2 | 4'
                          )
 
+    def test_validate_fail_values_int(self):
+        self.c.name = 'years_on_team'
+        self.c.dtype = int
+        self.c.order = [1, 2, 3]
+        with self.assertRaises(ValueError):
+            self.c.validate(self.map_)
+        self.assertEqual(self.c.log[1]['transformation'],
+                         'The following are not valid values: 4')
+
+    def test_summarize_categorical_dtype(self):
+        iseries = pd.Series(['Striker', 'Goalie', 'Zamboni', 'Striker'],
+                            dtype=CategoricalDtype(
+                                ['Striker', 'D-man', 'Goalie', 'Zamboni',
+                                 'Coach']
+                                ))
+        test = self.c._summarize(iseries)
+        self.assertEqual(test['rows'], 4)
+        self.assertEqual(test['cast_errors'], 0)
+        self.assertEqual(list(test['invalid_values']), ['Zamboni'])
+        self.assertEqual(list(test['observed_values']),
+                         ['Striker', 'Goalie'])
+        known = self.c._summarize(iseries.astype(object))
+        self.assertEqual(list(known['invalid_values']),
+                         list(test['invalid_values']))
+        self.assertEqual(list(known['observed_values']),
+                         list(test['observed_values']))
+
+    def test_summarize_categorical_dtype_cast_error(self):
+        self.c.dtype = int
+        self.c.order = [1, 2, 3]
+        iseries = pd.Series(['1', 'one', 'one', np.nan, '2'],
+                            dtype='category')
+        test = self.c._summarize(iseries)
+        self.assertEqual(test['rows'], 5)
+        self.assertEqual(test['cast_errors'], 2)
+        self.assertEqual(list(test['error_values']), ['one'])
+        self.assertEqual(list(test['observed_values']), [1, 2])
+
+    def test_group_codes(self):
+        iseries = pd.Series(['Goalie', 'Zamboni', np.nan, 'Striker',
+                             'Goalie'])
+        npt.assert_array_equal(self.c._group_codes(iseries),
+                               np.array([2, -1, -1, 0, 2]))
+
+    def test_count_values(self):
+        npt.assert_array_equal(self.c._count_values(self.map_['position']),
+                               np.array([1, 2, 1]))
+        iseries = self.map_['position'].astype('category')
+        npt.assert_array_equal(self.c._count_values(iseries),
+                               np.array([1, 2, 1]))
+
+    def test_below_cutoff(self):
+        npt.assert_array_equal(self.c._below_cutoff([1, 2, 1]),
+                               np.array([False, False, False]))
+        self.c.frequency_cutoff = 2
+        npt.assert_array_equal(self.c._below_cutoff([1, 2, 1]),
+                               np.array([True, False, True]))
+
+    def test_check_order(self):
+        dseries = pd.Series([1, 4, np.nan, 2, 4], dtype=float)
+        test = self.c._check_order(dseries, [1, 2, 3])
+        npt.assert_array_equal(test,
+                               np.array([False, True, False, False, True]))
+
     def test_validate_pass(self):
         self.c.validate(self.map_)
         log_entry = self.c.log[0]
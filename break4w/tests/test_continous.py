@@ -5,7 +5,7 @@ import numpy.testing as npt
 import pandas as pd
 import pandas.util.testing as pdt
 
-from break4w.continous import Continous
+from break4w.continous import Continous, _value_range
 
 
 class ContinousTest(TestCase):
@@ -239,6 +239,37 @@ blanks      None
                          'There are values less than 2 and greater than'
                          ' 3 years')
 
+    def test_summarize_all_null(self):
+        iseries = pd.Series(['TBD', np.nan, 'TBD'])
+        self.c.blanks = 'TBD'
+        test = self.c._summarize(iseries)
+        self.assertEqual(test['rows'], 3)
+        self.assertTrue(np.isnan(test['min']))
+        self.assertTrue(np.isnan(test['max']))
+
+    def test_error_masks_crossed(self):
+        iseries = pd.Series([0.0, 1.0, np.nan, 5.0])
+        self.c.limits = [1, 4]
+        values, masks = self.c._error_masks(iseries)
+        npt.assert_array_equal(masks['lower limit'],
+                               np.array([True, False, False, False]))
+        npt.assert_array_equal(masks['upper limit'],
+                               np.array([False, False, False, True]))
+
+    def test_error_masks_not_crossed(self):
+        iseries = pd.Series([1.0, np.nan, 3.0])
+        self.c.limits = [1, 4]
+        values, masks = self.c._error_masks(iseries)
+        self.assertEqual(list(masks.keys()), ['cast'])
+
+    def test_value_range(self):
+        self.assertEqual(_value_range(np.array([3, np.nan, -1, 2])),
+                         (-1, 3))
+        test = _value_range(np.array([np.nan, np.nan]))
+        self.assertTrue(np.isnan(test).all())
+        test = _value_range(np.array([]))
+        self.assertTrue(np.isnan(test).all())
+
     def test_check_limits_none(self):
         limits = None
         [lower, upper] = self.c._check_limits(limits, 'limits')
@@ -1,8 +1,12 @@
 from unittest import TestCase, main
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import datetime
+import json
+import os
+import tempfile
 
 import numpy as np
 import pandas as pd
@@ -13,6 +17,8 @@ from pandas.api.types import CategoricalDtype
 
 from break4w.data_dictionary import DataDictionary
 from break4w.question import Question
+from break4w.profiling import ValidationProfile
+from break4w.provenance import ProvenanceLog
 from break4w.categorical import Categorical
 from break4w.bool import Bool
 from break4w.continous import Continous
@@ -91,7 +97,7 @@ class DictionaryTest(TestCase):
         self.assertTrue(isinstance(self.d['team_captain'], Bool))
         self.assertTrue(isinstance(self.d['nickname'], Question))
         # Checks the log
-        self.assertTrue(isinstance(self.d.log, list))
+        self.assertTrue(isinstance(self.d.log, ProvenanceLog))
         self.assertEqual(len(self.d.log), 0)
 
         # Checks the description
@@ -110,6 +116,39 @@ class DictionaryTest(TestCase):
         with self.assertRaises(ValueError):
             DataDictionary(self.columns, self.types, d)
 
+    def test_init_lazy(self):
+        test = DataDictionary(self.columns, self.types, 
+                              description=self.desc, lazy=True)
+        self.assertEqual(test.columns, self.d.columns)
+        self.assertEqual(list(test.keys()), list(self.d.keys()))
+        self.assertEqual(str(test), str(self.d))
+        self.assertFalse(any([isinstance(q, Question) 
+                              for q in OrderedDict.values(test)]))
+
+        position = test.get_question('position')
+        self.assertTrue(isinstance(position, Categorical))
+        self.assertTrue(OrderedDict.__getitem__(test, 'position') is position)
+        self.assertFalse(isinstance(
+            OrderedDict.__getitem__(test, 'nickname'), Question))
+
+        test.validate(self.map_)
+        self.assertTrue(all([isinstance(q, Question) 
+                             for q in OrderedDict.values(test)]))
+
+    def test_lazy_accessors(self):
+        test = DataDictionary(self.columns, self.types, lazy=True)
+        name, question = test.popitem()
+        self.assertEqual(name, 'nickname')
+        self.assertTrue(isinstance(question, Question))
+        name, question = test.popitem(last=False)
+        self.assertEqual(name, 'years_on_team')
+        self.assertTrue(isinstance(question, Continous))
+        self.assertTrue(isinstance(test.setdefault('position'), Categorical))
+        self.assertTrue(isinstance(test.pop('team_captain'), Bool))
+        self.assertEqual(list(test.keys()), ['position'])
+        with self.assertRaises(KeyError):
+            DataDictionary([], []).popitem()
+
     def test_str_(self):
         known = ('Data Dictionary with 4 columns\n'
                  '\tJohnson doesnt know man, this is a weird study.\n'
@@ -139,8 +178,63 @@ class DictionaryTest(TestCase):
         self.assertEqual(log_['transformation'], None)
 
     def test_pull_question_log(self):
-        with self.assertRaises(NotImplementedError):
-            self.d._pull_question_log()
+        self.d.validate(self.map_)
+        start = len(self.d.log)
+        self.d._pull_question_log('position')
+        self.assertEqual(self.d.log[start:], list(self.d['position'].log))
+
+    def test_pull_question_log_all(self):
+        self.d.validate(self.map_)
+        start = len(self.d.log)
+        self.d._pull_question_log()
+        self.assertEqual(len(self.d.log), 
+                         start + sum([len(q.log) for q in self.d.values()]))
+        timestamps = [l_['timestamp'] for l_ in self.d.log[start:]]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_pull_question_log_error(self):
+        with self.assertRaises(ValueError):
+            self.d._pull_question_log('coach')
+
+    def test_query_log(self):
+        start = datetime.datetime.now()
+        self.d.get_question('position')
+        self.d.validate(self.map_)
+        test = self.d.query_log(column='position')
+        self.assertEqual([l_['command'] for l_ in test],
+                         ['get question', 'validate', 'validate'])
+        self.assertEqual(test[1:], list(self.d['position'].log))
+        # The dictionary also logs the column check and the overall result
+        self.assertEqual(len(self.d.query_log(command='validate')), 
+                         len(self.d['years_on_team'].log) + 
+                         len(self.d['team_captain'].log) +
+                         len(self.d['position'].log) + 2)
+        self.assertEqual(self.d.query_log(transform_type='error'), [])
+        self.assertEqual(len(self.d.query_log(column='position', 
+                                              since=start)), 3)
+        self.assertEqual(self.d.query_log(column='coach'), [])
+
+    def test_write_provenance(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'provenance.jsonl')
+            self.d.get_question('position')
+            self.d.write_provenance(fp_)
+            self.d.validate(self.map_)
+            self.d.add_question({'name': 'coach', 
+                                 'description': 'Who coaches the team?',
+                                 'dtype': str})
+            self.d['coach']._update_log('test', 'pass', 'Coach Hall')
+            store = self.d.log.store
+            self.assertTrue(self.d['position'].log.store is store)
+            self.assertTrue(self.d['coach'].log.store is store)
+
+            # The dictionary log also has a `get question` entry for the
+            # column
+            test = list(store.read(column='position'))
+            self.assertEqual(test[1:], list(self.d['position'].log))
+            self.assertEqual(len(list(store.read(command='get question'))),
+                             1)
+            self.assertEqual(len(list(store.read(column='coach'))), 2)
 
     def test_add_question_default(self):
         # Adds the `years_on_team` question.
@@ -213,6 +307,52 @@ class DictionaryTest(TestCase):
         with self.assertRaises(ValueError):
             self.d.add_question('')
 
+    def test_add_questions(self):
+        self.empty.add_questions(self.columns, self.types)
+        self.assertEqual(list(self.empty.keys()), list(self.d.keys()))
+        self.assertEqual(self.empty.columns, list(self.d.keys()))
+        self.assertTrue(isinstance(self.empty['team_captain'], Bool))
+        # Checks the log
+        self.assertEqual(len(self.empty.log), 1)
+        log_ = self.empty.log[0]
+        self.assertEqual(log_['command'], 'add columns')
+        self.assertEqual(log_['transform_type'], None)
+        self.assertEqual(log_['transformation'],
+                         '4 questions were added to the dictionary')
+
+    def test_add_questions_shared(self):
+        columns = [{'name': name, 'description': name, 'dtype': str,
+                    'order': ['a', 'b'], 'missing': ['TBD']}
+                   for name in ['first', 'second']]
+        self.empty.add_questions(columns, ['categorical', 'categorical'])
+        self.assertTrue(self.empty['first'].order is
+                        self.empty['second'].order)
+        self.assertTrue(self.empty['first'].missing is
+                        self.empty['second'].missing)
+        d = DataDictionary(columns, ['categorical', 'categorical'])
+        self.assertFalse(d['first'].order is self.empty['first'].order)
+        with self.assertRaises(AttributeError):
+            self.empty['first'].order.append('c')
+        self.empty['first'].order = ['a', 'b', 'c']
+        self.assertEqual(list(self.empty['second'].order), ['a', 'b'])
+
+    def test_add_questions_error(self):
+        self.d.drop_question('nickname')
+        with self.assertRaises(ValueError):
+            self.d.add_questions(self.columns[2:], self.types[2:])
+        self.assertEqual(self.d.columns, 
+                         ['years_on_team', 'team_captain', 'position'])
+        self.assertEqual(self.d.log[-1]['transform_type'], 'error')
+        self.assertEqual(self.d.log[-1]['transformation'],
+                         'The following already have dictionary entries: '
+                         'position')
+
+    def test_add_questions_repeated(self):
+        with self.assertRaises(ValueError):
+            self.empty.add_questions([self.columns[0], self.columns[0]], 
+                                     [self.types[0], self.types[0]])
+        self.assertEqual(len(self.empty), 0)
+
     def test_get_question(self):
         test = self.d.get_question('years_on_team')
         # Checks the returned value
@@ -226,6 +366,12 @@ class DictionaryTest(TestCase):
         self.assertEqual(log_['transform_type'], None)
         self.assertEqual(log_['transformation'], None)
 
+    def test_get_question_quiet_log(self):
+        self.d.log.verbosity = 1
+        test = self.d.get_question('years_on_team')
+        self.assertTrue(isinstance(test, Continous))
+        self.assertEqual(len(self.d.log), 0)
+
     def test_get_question_error(self):
         with self.assertRaises(ValueError):
             self.empty.get_question('years_on_team')
@@ -294,6 +440,15 @@ class DictionaryTest(TestCase):
             'blanks : None > not applicable | semester_conversion : add > 2'
             )
 
+    def test_update_question_resets_plan(self):
+        self.map_.loc['Bitty', 'years_on_team'] = 'not applicable'
+        self.d.validate(self.map_)
+        self.d.update_question({'limits': [3, None]}, name='years_on_team')
+        with self.assertRaises(ValueError):
+            self.d.validate(self.map_)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'There are values less than 3 years')
+
     def test_validate_question_order_pass(self):
         self.d._validate_question_order(self.map_)
         # Checks the log
@@ -407,6 +562,355 @@ class DictionaryTest(TestCase):
             'There were issues with the following columns:\nyears_on_team\n'
             'Please See the log for more details.')
 
+    def test_validate_workers_error(self):
+        kcolumns = pd.Series([None, 'years_on_team', 'team_captain',
+                              'position', None],
+                             name='column')
+        kvalidate = pd.Series(['pass', 'pass', 'error', 'pass', 'error'],
+                              name='transform_type')
+        self.map_.loc['Johnson', 'team_captain'] = 'Bad'
+        with self.assertRaises(ValueError):
+            self.d.validate(self.map_, workers=2)
+        log_ = pd.DataFrame(self.d.log)
+        pdt.assert_series_equal(kvalidate, log_['transform_type'])
+        pdt.assert_series_equal(kcolumns, log_['column'])
+        self.assertEqual(self.d['team_captain'].log[-1]['transformation'],
+                         'the data cannot be cast to bool')
+        self.assertEqual(len(self.d['years_on_team'].log), 2)
+
+    def test_validate_verbosity_0(self):
+        self.d.log.verbosity = 0
+        for question in self.d.values():
+            question._update_log('validate', 'error', 'an old message')
+            question.log.verbosity = 0
+        self.map_.loc['Johnson', 'team_captain'] = 'Bad'
+        with self.assertRaises(ValueError) as err:
+            self.d.validate(self.map_)
+        self.assertEqual(str(err.exception),
+                         'There were issues with the following columns:\n'
+                         '\tteam_captain - the data cannot be cast to bool')
+        self.assertEqual(len(self.d['team_captain'].log), 1)
+        test = self.d.validate_many([self.map_])
+        self.assertEqual(test.loc[2, 'message'],
+                         'the data cannot be cast to bool')
+        self.assertEqual(test.loc[1, 'message'], 'the data passed validation')
+
+    def test_validate_incremental_verbosity_0(self):
+        self.d.validate(self.map_, incremental=True)
+        for question in self.d.values():
+            question.log.verbosity = 0
+        self.d.validate(self.map_, incremental=True)
+        self.assertEqual(len(self.d.log), 7)
+        self.assertEqual(len(self.d['position'].log), 2)
+
+    def test_validate_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.d.validate(self.map_, executor=executor)
+        self.assertEqual(len(self.d.log), 5)
+        self.assertEqual(self.d.log[-1]['transformation'], 
+                         'All columns passed')
+        self.assertEqual(len(self.d['team_captain'].log), 2)
+
+    def test_validate_profile(self):
+        seen = []
+        profile = ValidationProfile(callbacks=seen.append)
+        self.map_.loc['Johnson', 'team_captain'] = 'Bad'
+        with self.assertRaises(ValueError):
+            self.d.validate(self.map_, profile=profile)
+        test = profile.to_frame()
+        self.assertEqual(test['column'].tolist(),
+                         ['years_on_team', 'team_captain', 'position'])
+        self.assertEqual(test['passed'].tolist(), [True, False, True])
+        self.assertEqual(test['rows'].tolist(), [4, 4, 4])
+        self.assertTrue((test['bytes'] > 0).all())
+        self.assertTrue((test['wall_time'] >= test['cast']).all())
+        self.assertEqual(test.loc[2, 'type'], 'Categorical')
+        self.assertTrue(test.loc[2, 'check'] > 0)
+        self.assertEqual(len(seen), 3)
+
+    def test_validate_profile_workers(self):
+        profile = ValidationProfile()
+        self.d.validate(self.map_, workers=2, profile=profile)
+        self.assertEqual(set(profile.to_frame()['column']),
+                         {'years_on_team', 'team_captain', 'position'})
+        self.assertTrue(all(profile.to_frame()['passed']))
+
+    def test_validate_incremental(self):
+        self.d.validate(self.map_, incremental=True)
+        self.assertEqual(len(self.d['years_on_team'].log), 2)
+        self.d.validate(self.map_, incremental=True)
+        self.assertEqual(len(self.d['years_on_team'].log), 3)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'the data and definition have not changed since '
+                         'the last passing validation')
+        self.assertEqual(self.d.log[-1]['transformation'],
+                         'All columns passed')
+
+        # Changing the definition or the data forces a new validation
+        self.d['years_on_team'].limits = [2, None]
+        with self.assertRaises(ValueError):
+            self.d.validate(self.map_, incremental=True)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'There are values less than 2 years')
+        self.map_.loc['Bitty', 'position'] = 'Goalie'
+        self.d['years_on_team'].limits = [1, None]
+        self.d.validate(self.map_, incremental=True)
+        self.assertEqual(self.d['position'].log[-1]['transformation'],
+                         'all values were valid')
+        self.assertEqual(self.d['team_captain'].log[-1]['transformation'],
+                         'the data and definition have not changed since '
+                         'the last passing validation')
+
+    def test_validate_cache(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'cache.json')
+            self.d.validate(self.map_, cache=fp_)
+            self.assertTrue(os.path.exists(fp_))
+            new_ = DataDictionary(self.columns, self.types)
+            new_.validate(self.map_, cache=fp_)
+        self.assertEqual(len(new_['position'].log), 1)
+        self.assertEqual(new_['position'].log[-1]['transformation'],
+                         'the data and definition have not changed since '
+                         'the last passing validation')
+
+    def test_validate_cache_unwritable(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'missing', 'cache.json')
+            self.d.validate(self.map_, cache=fp_)
+            self.assertFalse(os.path.exists(fp_))
+            os.mkdir(os.path.dirname(fp_))
+            with open(fp_, 'w') as f_:
+                f_.write('{"position": ')
+            self.d.validate(self.map_, cache=fp_)
+            self.assertEqual(os.listdir(os.path.dirname(fp_)),
+                             ['cache.json'])
+            with open(fp_) as f_:
+                self.assertTrue('position' in json.load(f_))
+
+    def test_validate_append(self):
+        self.assertEqual(self.d.validate_append(self.map_.iloc[:2]), 2)
+        self.assertEqual(self.d.validate_append(self.map_, full_file=True), 4)
+        summary = self.d._append_summaries['years_on_team'][1]
+        self.assertEqual(summary['rows'], 4)
+        self.assertEqual((summary['min'], summary['max']), (1, 4))
+        summary = self.d._append_summaries['position'][1]
+        self.assertEqual(set(summary['observed_values']),
+                         {'Striker', 'D-man', 'Goalie'})
+
+        # A failing batch leaves the stored state alone
+        tail = self.map_.iloc[:1].copy()
+        tail['years_on_team'] = 0
+        with self.assertRaises(ValueError):
+            self.d.validate_append(tail)
+        self.assertEqual(self.d.validate_append(self.map_.iloc[:1]), 5)
+
+    def test_validate_append_definition_change(self):
+        self.d.validate_append(self.map_)
+        self.d['position'].order = ['Striker', 'D-man', 'Goalie', 'Coach']
+        with self.assertRaises(ValueError):
+            self.d.validate_append(self.map_.iloc[:1])
+        self.assertEqual(self.d.validate_append(self.map_, reset=True), 4)
+
+    def test_validate_many(self):
+        bad = self.map_.copy()
+        bad.loc['Johnson', 'team_captain'] = 'Bad'
+        test = self.d.validate_many([self.map_, bad, bad[['position']]])
+        self.assertEqual(list(test.columns),
+                         ['map', 'column', 'passed', 'message'])
+        self.assertEqual(test['map'].tolist(), [0] * 4 + [1] * 4 + [2])
+        self.assertEqual(test['column'].tolist()[:4],
+                         [None, 'years_on_team', 'team_captain', 'position'])
+        self.assertEqual(test['passed'].tolist(),
+                         [True] * 6 + [False, True, False])
+        self.assertEqual(test.loc[6, 'message'],
+                         'the data cannot be cast to bool')
+        self.assertEqual(len(self.d.log), 1)
+        self.assertEqual(self.d.log[0]['command'], 'validate many')
+        self.assertEqual(self.d.log[0]['transformation'],
+                         '1 of 3 mapping files passed')
+
+    def test_validate_many_workers(self):
+        self.map_['years_on_team'] = [1, 2, 2, 4]
+        bad = self.map_.copy()
+        bad.loc['Johnson', 'years_on_team'] = 0
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.tsv')
+            self.map_.to_csv(fp_, sep='\t', index_label='sample_name')
+            known = self.d.validate_many([fp_, bad], index_col=0)
+            test = self.d.validate_many([fp_, bad], workers=2, index_col=0)
+        pdt.assert_frame_equal(test, known)
+        self.assertEqual(test['map'].tolist(), [fp_] * 4 + [1] * 4)
+        self.assertEqual(test['passed'].tolist(),
+                         [True] * 5 + [False, True, True])
+
+    def test_count_values(self):
+        self.d['position'].frequency_cutoff = 2
+        known = pd.DataFrame(
+            {'column': ['team_captain', 'team_captain', 'position',
+                        'position', 'position'],
+             'value': [False, True, 'Striker', 'D-man', 'Goalie'],
+             'count': [1, 2, 1, 2, 1],
+             'below_cutoff': [False, False, True, False, True]},
+            columns=['column', 'value', 'count', 'below_cutoff'])
+        known['value'] = known['value'].astype(object)
+        pdt.assert_frame_equal(self.d.count_values(self.map_), known)
+        chunks = [self.map_.iloc[:1], self.map_.iloc[1:]]
+        pdt.assert_frame_equal(self.d.count_values(chunks), known)
+
+    def test_count_values_file(self):
+        self.d['position'].frequency_cutoff = 2
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.tsv')
+            self.map_.to_csv(fp_, sep='\t', index_label='sample_name')
+            test = self.d.count_values(fp_, chunksize=1, index_col=0)
+        pdt.assert_frame_equal(test, self.d.count_values(self.map_))
+
+    def test_apply_cutoffs(self):
+        self.d['position'].frequency_cutoff = 2
+        test = self.d.apply_cutoffs(self.map_, value='other')
+        self.assertEqual(test['position'].tolist(),
+                         ['other', 'D-man', 'D-man', 'other'])
+        self.assertEqual(self.map_['position'].tolist(),
+                         ['Striker', 'D-man', 'D-man', 'Goalie'])
+        pdt.assert_series_equal(test['team_captain'],
+                                self.map_['team_captain'])
+        self.assertEqual(self.d.log[-1]['column'], 'position')
+        self.assertEqual(self.d.log[-1]['transformation'],
+                         '2 responses in groups with fewer than 2 responses '
+                         'were replaced with other: Striker | Goalie')
+
+    def test_apply_cutoffs_counts(self):
+        self.d['position'].frequency_cutoff = 2
+        counts = self.d.count_values(self.map_)
+        test = self.d.apply_cutoffs(self.map_.iloc[:2], counts,
+                                    record=False)
+        self.assertTrue(pd.isnull(test['position'].iloc[0]))
+        self.assertEqual(test['position'].iloc[1], 'D-man')
+        self.assertEqual(len(self.d.log), 0)
+
+    def test_read_csv(self):
+        self.map_['years_on_team'] = ['1', '2', 'not applicable', '4']
+        self.map_['extra'] = 'x'
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.tsv')
+            self.map_.to_csv(fp_, sep='\t', index_label='sample_name')
+            test = self.d.read_csv(fp_, index_col=0, check_order=False,
+                                   validate=False)
+        self.assertEqual(list(test.columns), 
+                         ['years_on_team', 'team_captain', 'position',
+                          'nickname'])
+        self.assertEqual(test.index.name, 'sample_name')
+        self.assertTrue(isinstance(test['years_on_team'].dtype,
+                                   CategoricalDtype))
+        self.assertEqual(test.loc['Holster', 'years_on_team'],
+                         'not applicable')
+        self.assertTrue(isinstance(test['team_captain'].dtype,
+                                   CategoricalDtype))
+        self.assertTrue(isinstance(test['position'].dtype, CategoricalDtype))
+        self.assertEqual(test['nickname'].dtype, object)
+        self.d.validate(test)
+
+    def test_read_csv_cast(self):
+        self.map_['years_on_team'] = ['1', '2', 'not applicable', '01']
+        self.map_['team_captain'] = ['yes', 'False', 'TBD', 'true']
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.csv')
+            self.map_.to_csv(fp_)
+            test = self.d.read_csv(fp_, index_col=0)
+        self.assertTrue(isinstance(test['years_on_team'].dtype,
+                                   CategoricalDtype))
+        self.assertEqual(test['years_on_team'].tolist(),
+                         [1, 2, 'not applicable', 1])
+        self.assertEqual(len(test['years_on_team'].cat.categories), 3)
+        self.assertTrue(isinstance(test['team_captain'].dtype,
+                                   CategoricalDtype))
+        self.assertEqual(test['team_captain'].tolist(),
+                         [True, False, 'TBD', True])
+        self.assertEqual(test['position'].tolist(),
+                         self.map_['position'].tolist())
+        self.d.validate(test)
+
+    def test_read_csv_validate_error(self):
+        self.map_['years_on_team'] = ['1', '2', '2.5', '4']
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.csv')
+            self.map_.to_csv(fp_)
+            with self.assertRaises(ValueError):
+                self.d.read_csv(fp_, index_col=0)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'the data cannot be cast to int')
+
+    def test_read_csv_int_decimal(self):
+        self.map_['years_on_team'] = ['1', '2', '2', '1.0']
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.csv')
+            self.map_.to_csv(fp_)
+            with self.assertRaises(ValueError):
+                self.d.validate_file(fp_, index_col=0)
+            with self.assertRaises(ValueError):
+                self.d.read_csv(fp_, index_col=0)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'the data cannot be cast to int')
+
+    def test_find_errors(self):
+        self.d['years_on_team'].limits = [2, 3]
+        self.map_['years_on_team'] = ['1', '2', 'two', '4']
+        self.map_.loc['Johnson', 'team_captain'] = 'Bad'
+        known = pd.DataFrame(
+            data=[['years_on_team', 'Holster', 'two', 'cast'],
+                  ['years_on_team', 'Bitty', '1', 'lower limit'],
+                  ['years_on_team', 'Johnson', '4', 'upper limit'],
+                  ['team_captain', 'Johnson', 'Bad', 'cast']],
+            columns=['column', 'index', 'value', 'rule'],
+            )
+        test = self.d.find_errors(self.map_)
+        pdt.assert_frame_equal(known, test)
+        self.assertEqual(self.d.log[-1]['transformation'],
+                         'There were 4 errors in 2 columns')
+
+    def test_find_errors_missing_column(self):
+        test = self.d.find_errors(self.map_.drop(columns=['position']))
+        self.assertEqual(test.shape, (1, 4))
+        self.assertEqual(test.loc[0, 'rule'], 'missing column')
+
+    def test_validate_file(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.tsv')
+            self.map_['years_on_team'] = ['1', '2', '2', '4']
+            self.map_.to_csv(fp_, sep='\t')
+            self.d.validate_file(fp_, chunksize=1, index_col=0)
+        self.assertEqual(len(self.d.log), 5)
+        self.assertEqual(self.d.log[-1]['transformation'], 
+                         'All columns passed')
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'The values were greater than or equal to 1 years')
+
+    def test_validate_file_error(self):
+        self.d['years_on_team'].limits = [2, 3]
+        self.d['position'].order = ['Striker', 'D-man']
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'map.csv')
+            self.map_['years_on_team'] = ['1', '2', '2', '4']
+            self.map_.to_csv(fp_)
+            with self.assertRaises(ValueError):
+                self.d.validate_file(fp_, chunksize=3, index_col=0)
+        self.assertEqual(self.d['years_on_team'].log[-1]['transformation'],
+                         'There are values less than 2 and greater than 3 '
+                         'years')
+        self.assertEqual(self.d['position'].log[-1]['transformation'],
+                         'The following are not valid values: Goalie')
+
+    def test_merge_summaries(self):
+        question = self.d['years_on_team']
+        left = question._summarize(pd.Series(['1', '4', 'x']))
+        right = question._summarize(pd.Series(['0', 'x', 'y']))
+        test = question._merge_summaries(left, right)
+        self.assertEqual(test['rows'], 6)
+        self.assertEqual(test['cast_errors'], 3)
+        self.assertEqual(list(test['error_values']), ['x', 'y'])
+        self.assertEqual(test['min'], 0)
+        self.assertEqual(test['max'], 4)
+
     def test_to_pandas_stata(self):
         known_vars = {x['name']: x['description'] for x in self.columns}
         test_desc, test_vars = self.d.to_pandas_stata()
@@ -467,6 +971,83 @@ class DictionaryTest(TestCase):
         test = self.d.to_dataframe(True, True)
         pdt.assert_frame_equal(known, test)
 
+    def test_snapshot(self):
+        self.d.validate(self.map_)
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'dictionary.b4w')
+            self.d.save_snapshot(fp_)
+            test = DataDictionary.load_snapshot(fp_)
+
+        self.assertEqual(test.description, self.d.description)
+        self.assertEqual(test.columns, self.d.columns)
+        self.assertEqual(test.log, [])
+        for name, known in self.d.items():
+            self.assertTrue(type(test[name]) is type(known))
+            self.assertTrue('_plan' in test[name].__dict__)
+            self.assertEqual(test[name].log, [])
+            self.assertEqual(
+                {k: v for k, v in test[name].__dict__.items() 
+                 if k not in {'log', '_plan'}},
+                {k: v for k, v in known.__dict__.items() 
+                 if k not in {'log', '_plan'}},
+                )
+        test.validate(self.map_)
+        self.assertEqual(test['team_captain'].log[-1]['transformation'],
+                         'all values were valid')
+
+    def test_snapshot_log(self):
+        self.d.validate(self.map_)
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'dictionary.b4w')
+            self.d.save_snapshot(fp_, log=True)
+            test = DataDictionary.load_snapshot(fp_)
+        self.assertEqual(len(test.log), len(self.d.log))
+        self.assertEqual(test['position'].log, self.d['position'].log)
+
+    def test_snapshot_long_order(self):
+        order_a = ['level_%i' % i for i in range(200)]
+        order_b = order_a[:50] + ['zzz'] + order_a[51:]
+        d = DataDictionary(
+            [{'name': 'a', 'description': 'a', 'dtype': str,
+              'order': order_a},
+             {'name': 'b', 'description': 'b', 'dtype': str,
+              'order': order_b}],
+            ['categorical', 'categorical'])
+        map_ = pd.DataFrame({'a': ['level_50'], 'b': ['zzz']})
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'dictionary.b4w')
+            d.save_snapshot(fp_)
+            test = DataDictionary.load_snapshot(fp_)
+        self.assertEqual(list(test['b']._validator_plan()['categories']
+                              .categories), order_b)
+        test.validate(map_)
+
+    def test_snapshot_error(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'dictionary.b4w')
+            with open(fp_, 'wb') as f_:
+                f_.write(b'not a snapshot')
+            with self.assertRaises(ValueError):
+                DataDictionary.load_snapshot(fp_)
+            with open(fp_, 'wb') as f_:
+                f_.write(b'B4WSNAP\xff\x00')
+            with self.assertRaises(ValueError):
+                DataDictionary.load_snapshot(fp_)
+
+    def test_to_dataframe_matches_series(self):
+        self.d['nickname'].var_labels = {1: 'Bitty', 2: 'Ransom'}
+        self.d['nickname'].notes = 'Only the frogs'
+        series = [q._to_series().rename({'limits': 'order'}) 
+                  for q in self.d.values()]
+        known = pd.concat(axis=1, sort=False, objs=series).T
+        known.loc[known['var_labels'].notna(), 'order'] = \
+            known.loc[known['var_labels'].notna(), 'var_labels']
+        known = known.drop(columns=['var_labels']).set_index('name')
+
+        test = self.d.to_dataframe()
+        pdt.assert_frame_equal(known, test)
+        self.assertEqual(known.to_csv(), test.to_csv())
+
     def test_read_dataframe(self):
         columns = ['years_on_team', 'team_captain', 'position', 'nickname']
         df_ = pd.DataFrame(
@@ -502,6 +1083,21 @@ class DictionaryTest(TestCase):
         self.assertTrue(isinstance(test_['team_captain'], Bool))
         self.assertTrue(isinstance(test_['nickname'], Question))
 
+    def test_read_dataframe_lazy(self):
+        self.d['team_captain'].dtype = str
+        df_ = self.d.to_dataframe()
+        test = DataDictionary.read_dataframe(df_.copy(), lazy=True)
+        self.assertEqual(test.columns, self.d.columns)
+        self.assertFalse(isinstance(
+            OrderedDict.__getitem__(test, 'years_on_team'), Question))
+        known = DataDictionary.read_dataframe(df_.copy())
+        for name, question in test.items():
+            self.assertTrue(type(question) is type(known[name]))
+            self.assertEqual(
+                {k: v for k, v in question.__dict__.items() if k != 'log'},
+                {k: v for k, v in known[name].__dict__.items() 
+                 if k != 'log'})
+
     def test_roundtrip(self):
         known_ = self.d
         known_['team_captain'].dtype = str
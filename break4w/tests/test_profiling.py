@@ -0,0 +1,72 @@
+from unittest import TestCase, main
+
+import pandas as pd
+
+from break4w.continous import Continous
+from break4w.profiling import (ValidationProfile,
+                               phase,
+                               phases,
+                               profile_columns,
+                               )
+
+
+class ValidationProfileTest(TestCase):
+
+    def setUp(self):
+        self.q = Continous('percentage', 'a percentage', limits=[0, 100])
+        self.map_ = pd.DataFrame({'percentage': ['5', '10.5', 'nope', '60']})
+        self.profile = ValidationProfile()
+
+    def test_init(self):
+        self.assertEqual(len(self.profile), 0)
+        self.assertEqual(self.profile.callbacks, [])
+        profile = ValidationProfile(print)
+        self.assertEqual(profile.callbacks, [print])
+
+    def test_measure(self):
+        self.map_.loc[2, 'percentage'] = 'not applicable'
+        with self.profile.measure(self.q, self.map_) as record:
+            self.q.validate(self.map_)
+        self.assertEqual(len(self.profile), 1)
+        self.assertTrue(self.profile.records[0] is record)
+        self.assertEqual(list(record.keys()), profile_columns)
+        self.assertEqual(record['column'], 'percentage')
+        self.assertEqual(record['type'], 'Continous')
+        self.assertEqual(record['rows'], 4)
+        self.assertEqual(record['bytes'],
+                         self.map_['percentage'].memory_usage(index=False,
+                                                              deep=True))
+        self.assertTrue(record['passed'])
+        for name in phases:
+            self.assertTrue(0 < record[name] <= record['wall_time'])
+
+    def test_measure_error(self):
+        seen = []
+        self.profile.callbacks.append(seen.append)
+        with self.assertRaises(TypeError):
+            with self.profile.measure(self.q, self.map_):
+                self.q.validate(self.map_)
+        self.assertEqual(len(seen), 1)
+        self.assertFalse(seen[0]['passed'])
+        self.assertTrue(seen[0]['cast'] > 0)
+
+    def test_phase_disabled(self):
+        self.assertTrue(phase('cast') is phase('check'))
+        with phase('cast'):
+            pass
+
+    def test_to_frame(self):
+        pd.testing.assert_frame_equal(self.profile.to_frame(),
+                                      pd.DataFrame(columns=profile_columns))
+        with self.profile.measure(self.q, self.map_.iloc[:2]):
+            self.q.validate(self.map_.iloc[:2])
+        self.profile.clear()
+        with self.profile.measure(self.q, self.map_.iloc[:2]):
+            self.q.validate(self.map_.iloc[:2])
+        test = self.profile.to_frame()
+        self.assertEqual(test.shape, (1, len(profile_columns)))
+        self.assertEqual(test.loc[0, 'rows'], 2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+from unittest import TestCase, main
+
+import datetime
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+import pandas.util.testing as pdt
+
+from break4w.provenance import (ProvenanceLog,
+                                JSONLinesStore,
+                                SQLiteStore,
+                                attach_store,
+                                open_store,
+                                )
+
+
+class ProvenanceLogTest(TestCase):
+
+    def setUp(self):
+        self.log = ProvenanceLog(max_entries=3)
+
+    def test_init(self):
+        self.assertEqual(len(self.log), 0)
+        self.assertEqual(self.log, [])
+        self.assertEqual(self.log.max_entries, 3)
+        self.assertEqual(self.log.verbosity, 2)
+
+    def test_init_empty(self):
+        other = ProvenanceLog()
+        self.assertTrue(self.log._times is other._times)
+        self.assertIsNone(self.log._index)
+        self.assertEqual(self.log.query(column='position'), [])
+        self.log.record('validate', column='position')
+        self.assertFalse(self.log._times is other._times)
+        self.assertEqual(self.log._labels, [None, 'position', 'validate'])
+        self.assertIsNone(other._labels)
+
+    def test_record(self):
+        self.log.record('validate', column='position', transform_type='pass',
+                        transformation='all values were valid')
+        self.assertEqual(len(self.log), 1)
+        log_ = self.log[0]
+        self.assertEqual(set(log_.keys()),
+                         {'timestamp', 'column', 'command', 'transform_type',
+                          'transformation'})
+        self.assertTrue(isinstance(log_['timestamp'], datetime.datetime))
+        self.assertEqual(log_['column'], 'position')
+        self.assertEqual(log_['command'], 'validate')
+        self.assertEqual(log_['transform_type'], 'pass')
+        self.assertEqual(log_['transformation'], 'all values were valid')
+        self.assertEqual(self.log[-1], log_)
+
+    def test_record_max_entries(self):
+        for i in range(5):
+            self.log.record('command %i' % i)
+        self.assertEqual(len(self.log), 3)
+        self.assertEqual([l_['command'] for l_ in self.log],
+                         ['command 2', 'command 3', 'command 4'])
+        self.assertEqual([l_['command'] for l_ in self.log[1:]],
+                         ['command 3', 'command 4'])
+        with self.assertRaises(IndexError):
+            self.log[3]
+
+    def test_since(self):
+        self.log.record('command 0')
+        recorded = self.log.recorded
+        for i in range(1, 5):
+            self.log.record('command %i' % i)
+        self.assertEqual([l_['command'] for l_ in self.log.since(recorded)],
+                         ['command 2', 'command 3', 'command 4'])
+        self.assertEqual(self.log.since(self.log.recorded), [])
+
+    def test_query(self):
+        log = ProvenanceLog(max_entries=0)
+        for i in range(10):
+            log.record('validate' if i % 2 else 'get question',
+                       column='position' if i % 3 else 'nickname',
+                       transform_type='pass')
+        self.assertEqual(len(log.query(column='position')), 6)
+        self.assertEqual(len(log.query(command='validate')), 5)
+        test = log.query(column='position', command='validate')
+        self.assertEqual(len(test), 3)
+        self.assertEqual(test, [l_ for l_ in log 
+                                if (l_['column'] == 'position') and 
+                                (l_['command'] == 'validate')])
+        self.assertEqual(len(log.query(transform_type='pass')), 10)
+        self.assertEqual(log.query(column='coach'), [])
+        self.assertEqual(log.query(transform_type='error'), [])
+        self.assertEqual(
+            log.query(since=datetime.datetime.now() + 
+                      datetime.timedelta(days=1)),
+            [])
+
+    def test_query_max_entries(self):
+        for i in range(5):
+            self.log.record('command %i' % (i % 2), column='position')
+        self.assertEqual([l_['command'] 
+                          for l_ in self.log.query(column='position')],
+                         ['command 0', 'command 1', 'command 0'])
+        self.assertEqual(len(self.log.query(command='command 1')), 1)
+
+    def test_query_rotating_columns(self):
+        log = ProvenanceLog(max_entries=100)
+        for i in range(20000):
+            log.record('validate', column='column %i' % (i % 400))
+        self.assertEqual(len(log._index[0]), 100)
+        self.assertEqual(sum([len(seqs) for seqs in log._index[0].values()]),
+                         100)
+        self.assertEqual(len(log._index[1][log._label_codes['validate']]),
+                         100)
+        self.assertEqual(log.query(column='column 0'), [])
+        self.assertEqual(len(log.query(column='column 399')), 1)
+
+    def test_record_unbounded(self):
+        log = ProvenanceLog(max_entries=0)
+        for i in range(20):
+            log.record('command %i' % i)
+        self.assertEqual(len(log), 20)
+        self.assertEqual(log[0]['command'], 'command 0')
+
+    def test_record_verbosity(self):
+        self.log.verbosity = 1
+        self.log.record('get question', column='position')
+        self.assertEqual(len(self.log), 0)
+        self.log.record('update question', column='position')
+        self.assertEqual(len(self.log), 1)
+        self.log.verbosity = 0
+        self.log.record('update question', column='position')
+        self.assertEqual(len(self.log), 1)
+
+    def test_append(self):
+        entry = {'timestamp': datetime.datetime(2018, 4, 1, 12, 30, 15, 1234),
+                 'column': 'position',
+                 'command': 'validate',
+                 'transform_type': 'error',
+                 'transformation': 'The following are not valid values: Lax',
+                 }
+        self.log.append(entry)
+        self.assertEqual(self.log[0], entry)
+        self.log.extend(['a note'])
+        self.assertEqual(self.log[1]['transformation'], 'a note')
+
+    def test_pickle(self):
+        self.log.record('validate', column='position', transform_type='pass')
+        self.log.record('get question', column='position')
+        test = pickle.loads(pickle.dumps(self.log))
+        self.assertEqual(test, self.log)
+        self.assertEqual(test.max_entries, 3)
+
+    def test_to_frame(self):
+        self.log.record('validate', column='position', transform_type='pass')
+        test = self.log.to_frame()
+        self.assertEqual(list(test.columns),
+                         ['timestamp', 'column', 'command', 'transform_type',
+                          'transformation'])
+        pdt.assert_series_equal(test['command'],
+                                pd.Series(['validate'], name='command'))
+        self.assertTrue(pd.isnull(test.loc[0, 'transformation']))
+
+
+
+class StoreTest(TestCase):
+
+    def setUp(self):
+        self.dir_ = tempfile.TemporaryDirectory()
+        self.entries = [
+            (10**18, 'position', 'validate', 'pass', 'all values were valid'),
+            (10**18 + 10**9, 'position', 'get question', None, None),
+            (10**18 + 2 * 10**9, 'nickname', 'validate', 'pass', None),
+            ]
+
+    def tearDown(self):
+        self.dir_.cleanup()
+
+    def check_store(self, store):
+        for row in self.entries:
+            store.write(row)
+        test = list(store.read())
+        self.assertEqual(len(test), 3)
+        self.assertEqual(test[0]['transformation'], 'all values were valid')
+        self.assertEqual(test[0]['timestamp'], 
+                         datetime.datetime.fromtimestamp(10**9))
+        self.assertEqual(len(list(store.read(column='position'))), 2)
+        self.assertEqual(len(list(store.read(command='validate'))), 2)
+        self.assertEqual(
+            [l_['column'] for l_ in store.read(since=10**18 + 10**9)],
+            ['position', 'nickname'])
+        self.assertEqual(
+            len(list(store.read(column='position', until=10**18 + 10**9))),
+            1)
+
+    def test_jsonl(self):
+        store = open_store(os.path.join(self.dir_.name, 'log.jsonl'))
+        self.assertTrue(isinstance(store, JSONLinesStore))
+        self.check_store(store)
+        store.close()
+
+    def test_sqlite(self):
+        store = open_store(os.path.join(self.dir_.name, 'log.db'))
+        self.assertTrue(isinstance(store, SQLiteStore))
+        self.check_store(store)
+        store.close()
+
+    def test_write_batches(self):
+        fp_ = os.path.join(self.dir_.name, 'log.jsonl')
+        store = JSONLinesStore(fp_, batch_size=2)
+        store.write(self.entries[0])
+        self.assertFalse(os.path.exists(fp_))
+        store.write(self.entries[1])
+        with open(fp_) as f_:
+            self.assertEqual(len(f_.readlines()), 2)
+        store.close()
+        store = JSONLinesStore(fp_)
+        self.assertEqual(len(list(store.read())), 2)
+
+    def test_log_store(self):
+        store = open_store(os.path.join(self.dir_.name, 'log.jsonl'))
+        log = ProvenanceLog(max_entries=2)
+        log.record('get question', column='position')
+        attach_store(log, store)
+        for i in range(3):
+            log.record('validate', column='position')
+        self.assertEqual(len(log), 2)
+        self.assertEqual(len(list(store.read())), 4)
+        log.load(store.read(command='get question'))
+        self.assertEqual(len(list(store.read())), 4)
+        store.close()
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 from unittest import TestCase, main
 
 import datetime
+import gc
+import json
+import os
+import tempfile
 
 import pandas as pd
 import numpy as np
@@ -8,7 +12,10 @@ import numpy.testing as npt
 import pandas.util.testing as pdt
 
 from break4w.question import (Question,
-                              _check_cmap
+                              _check_cmap,
+                              _intern,
+                              _interned,
+                              _interning,
                               )
 
 
@@ -121,6 +128,48 @@ class QuestionTest(TestCase):
                      missing=['Bitty'])
         self.assertEqual(q.missing, set(['Bitty']))
 
+    def test_init_missing_shared(self):
+        with _interning():
+            q1 = Question(name=self.name,
+                          description=self.description,
+                          dtype=self.dtype,
+                          missing=['Bitty', 'Jack'])
+            q2 = Question(name='nickname',
+                          description=self.description,
+                          dtype=self.dtype,
+                          missing={'Jack', 'Bitty'})
+            q3 = Question(name=self.name,
+                          description=self.description,
+                          dtype=self.dtype,
+                          missing=list(Question.ebi_null))
+            q5 = Question(name=self.name,
+                          description=self.description,
+                          dtype=self.dtype)
+        self.assertTrue(q1.missing is q2.missing)
+        self.assertEqual(q1.missing, {'Bitty', 'Jack'})
+        self.assertTrue(q3.missing is q5.missing)
+        self.assertEqual(q5.missing, Question.ebi_null)
+        with self.assertRaises(AttributeError):
+            q1.missing.add('Kent')
+        q4 = Question(name='nickname',
+                      description=self.description,
+                      dtype=self.dtype,
+                      missing=['Bitty', 'Jack'])
+        self.assertFalse(q4.missing is q1.missing)
+
+    def test_intern(self):
+        with _interning():
+            self.assertTrue(_intern(['a', 'b'], list) is
+                            _intern(('a', 'b'), list))
+            self.assertFalse(_intern(['b', 'a'], list) is
+                             _intern(['a', 'b'], list))
+            self.assertFalse(_intern({1}, set) is _intern({True}, set))
+            self.assertEqual(_intern(['a', 'b'], list), ('a', 'b'))
+            self.assertEqual(_intern([['a'], 'b'], list), [['a'], 'b'])
+        self.assertIsNone(_interned.table)
+        self.assertFalse(_intern(['a', 'b'], list) is
+                         _intern(['a', 'b'], list))
+
     def test__str__(self):
         known =  """
 ------------------------------------------------------------------------------------
@@ -173,9 +222,73 @@ player_name (Question str)
         pdt.assert_series_equal(known_log['transformation'],
                                 log_['transformation'])
 
+    def test_validator_plan_cached(self):
+        self.q.blanks = 'Lardo'
+        plan = self.q._validator_plan()
+        self.assertTrue(plan is self.q._validator_plan())
+        self.assertTrue('Lardo' in plan['placeholders'])
+        self.assertEqual(plan['cast_pass'], 'the data can be cast to str')
+        with self.assertRaises(TypeError):
+            plan['placeholders'] = set([])
+
+    def test_validator_plan_reset(self):
+        plan = self.q._validator_plan()
+        self.q.blanks = 'Lardo'
+        self.assertFalse('_plan' in self.q.__dict__)
+        self.assertFalse(plan is self.q._validator_plan())
+        self.assertTrue('Lardo' in self.q._validator_plan()['placeholders'])
+
+    def test_validator_plan_not_in_series(self):
+        self.q._validator_plan()
+        self.assertFalse('_plan' in self.q._to_series().index)
+
+    def test_write_provenance_file(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'provenance.jsonl')
+            self.q._update_log('dibs', 'replace', 'goalie > Bitty')
+            self.q.write_provenance(fp_)
+            self.q._update_log('dibs', 'replace', 'Bitty > Jack')
+            self.q.log.store.flush()
+            with open(fp_) as f_:
+                lines = f_.readlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[-1])['transformation'],
+                         'Bitty > Jack')
+
+    def test_write_provenance_file_collected(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'provenance.jsonl')
+            q = Question(name=self.name,
+                         description=self.description,
+                         dtype=self.dtype)
+            q.write_provenance(fp_)
+            for i in range(4):
+                q._update_log('dibs', 'replace', 'goalie %i' % i)
+            del q
+            gc.collect()
+            with open(fp_) as f_:
+                lines = f_.readlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[-1])['transformation'], 'goalie 3')
+
     def test_read_provenance(self):
-        with self.assertRaises(NotImplementedError):
-            self.q._read_provenance('fp_')
+        with tempfile.TemporaryDirectory() as dir_:
+            fp_ = os.path.join(dir_, 'provenance.db')
+            self.q._update_log('dibs', 'replace', 'goalie > Bitty')
+            self.q.write_provenance(fp_)
+            self.q.log.clear()
+            self.assertEqual(len(self.q.log), 0)
+
+            self.q._read_provenance(fp_)
+            self.assertEqual([l_['command'] for l_ in self.q.log],
+                             ['dibs', 'Write Log'])
+            self.q._read_provenance(fp_, command='dibs')
+            self.assertEqual(len(self.q.log), 1)
+            self.assertEqual(self.q.log[0]['transformation'], 
+                             'goalie > Bitty')
+            self.q._read_provenance(fp_, since=datetime.datetime.now())
+            self.assertEqual(len(self.q.log), 0)
+            self.q.log.store.close()
 
     def test_check_ontology(self):
         with self.assertRaises(NotImplementedError):
@@ -234,6 +347,86 @@ player_name (Question str)
         tseries = iseries.apply(f_)
         pdt.assert_series_equal(kseries, tseries)
 
+    def test_cast_series_int_placeholder(self):
+        iseries = pd.Series(data=['1', '2', 3.0, 'i dont skate', np.nan],
+                            index=['Whiskey', 'Chowder', 'Bitty', 'Lardo',
+                                   'Tango'],
+                            name='collegate_hockey_years')
+        kvalues = pd.Series(data=[1, 2, 3, np.nan, np.nan],
+                            index=iseries.index,
+                            name='collegate_hockey_years')
+        kerrors = pd.Series(data=[False, False, False, False, False],
+                            index=iseries.index,
+                            name='collegate_hockey_years')
+        tvalues, terrors = self.q._cast_series(iseries, int, {'i dont skate'})
+        pdt.assert_series_equal(kvalues, tvalues)
+        pdt.assert_series_equal(kerrors, terrors)
+
+    def test_cast_series_int_matches_remap(self):
+        iseries = pd.Series(['1', '1.0', '1_0', 1.5, ' 2 ', 'two', True])
+        f_ = self.q._identify_remap_function(int)
+        kerrors = iseries.apply(f_).apply(lambda x: x == 'error')
+        tvalues, terrors = self.q._cast_series(iseries, int)
+        npt.assert_array_equal(kerrors.values, terrors.values)
+        npt.assert_array_equal(tvalues.values,
+                               np.array([1, np.nan, 10, 1, 2, np.nan, 1]))
+
+    def test_cast_series_float_error(self):
+        iseries = pd.Series(['1', '2.5', 'i dont skate'])
+        tvalues, terrors = self.q._cast_series(iseries, float)
+        npt.assert_array_equal(tvalues.values, np.array([1, 2.5, np.nan]))
+        npt.assert_array_equal(terrors.values, np.array([False, False, True]))
+
+    def test_cast_series_str_categorical(self):
+        iseries = pd.Series(['Dorm', 'Haus', 'TBD'], dtype='category')
+        tvalues, terrors = self.q._cast_series(iseries, str, {'TBD'})
+        self.assertEqual(tvalues.tolist()[:2], ['Dorm', 'Haus'])
+        self.assertTrue(pd.isnull(tvalues.iloc[2]))
+        self.assertFalse(terrors.any())
+
+    def test_cast_series_bool(self):
+        iseries = pd.Series(['True', 'true', 1, 'nope', 'False', 0.0, 'cool'])
+        tvalues, terrors = self.q._cast_series(iseries, bool, {'nope'})
+        npt.assert_array_equal(
+            terrors.values,
+            np.array([False, False, False, False, False, False, True])
+            )
+        self.assertEqual(tvalues.tolist()[:3], [True, True, True])
+        self.assertEqual(tvalues.tolist()[4:6], [False, False])
+
+    def test_cast_series_bool_integer(self):
+        iseries = pd.Series([0, 1, 1, 0])
+        tvalues, terrors = self.q._cast_series(iseries, bool)
+        self.assertEqual(tvalues.tolist(), [False, True, True, False])
+        self.assertFalse(terrors.any())
+
+    def test_cast_series_bool_integer_error(self):
+        iseries = pd.Series([0, 1, 2])
+        tvalues, terrors = self.q._cast_series(iseries, bool)
+        npt.assert_array_equal(terrors.values, np.array([False, False, True]))
+
+    def test_cast_series_typed_float(self):
+        iseries = pd.Series([1.5, -1.5, np.nan, np.inf], name='years')
+        tvalues, terrors = self.q._cast_series(iseries, float, {'TBD'})
+        npt.assert_array_equal(tvalues.values, iseries.values)
+        self.assertFalse(terrors.any())
+        self.assertEqual(tvalues.name, 'years')
+
+    def test_cast_series_typed_int(self):
+        iseries = pd.Series([1.5, -1.5, np.nan, np.inf])
+        f_ = self.q._identify_remap_function(int)
+        kerrors = iseries.apply(f_).apply(lambda x: x == 'error')
+        tvalues, terrors = self.q._cast_series(iseries, int, {'TBD'})
+        npt.assert_array_equal(tvalues.values,
+                               np.array([1, -1, np.nan, np.nan]))
+        npt.assert_array_equal(terrors.values, kerrors.values)
+
+    def test_cast_series_typed_numeric_placeholder(self):
+        iseries = pd.Series([1, 2, -9])
+        tvalues, terrors = self.q._cast_series(iseries, int, {-9})
+        npt.assert_array_equal(tvalues.values, np.array([1, 2, np.nan]))
+        self.assertFalse(terrors.any())
+
     def test_iterable_to_str_null(self):
         test = self.q._iterable_to_str(None, null_value='---')
         self.assertEqual(test, '---')
@@ -346,6 +539,27 @@ player_name (Question str)
         self.assertEqual(q.derivative_columns, [])
         self.assertEqual(q.notes, None)
 
+    def test_read_frame(self):
+        df_ = pd.DataFrame(
+            data=[[self.name, self.description, 'str', 'TBD', 
+                   'Bitty=1 | Ransom=2', 'Ransom'],
+                  ['nickname', 'Name used on the ice', 'str', 'TBD',
+                   np.nan, 'None']],
+            columns=['name', 'description', 'dtype', 'missing', 'order',
+                     'ref_value'],
+            )
+        test = Question._read_frame(df_)
+        self.assertEqual(len(test), 2)
+        for q, (i, var_) in zip(*(test, df_.iterrows())):
+            known = Question._read_series(var_.dropna())
+            self.assertEqual(q.__dict__.keys(), known.__dict__.keys())
+            for k in ['name', 'description', 'dtype', 'missing', 'order',
+                      'var_labels', 'ref_value']:
+                self.assertEqual(getattr(q, k, None), getattr(known, k, None))
+        self.assertEqual(test[1].missing, {'TBD'})
+        self.assertIsNone(test[1].ref_value)
+        self.assertFalse(test[0].missing is test[1].missing)
+
     def test_read_series_bool(self):
         var_ = pd.Series({'name': self.name,
                           'description': self.description,
@@ -28,7 +28,7 @@ setup(name='break4w',
       author_email="jdebelius@ucsd.edu",
       # maintainer="J W Debelius",
       # maintainer_email="jdebelius@ucsd.edu",
-      packages=['break4w', 'break4w.tests'],
+      packages=['break4w', 'break4w.benchmarks', 'break4w.tests'],
       install_requires=['numpy >= 1.10.0',
                         'pandas >= 0.23.4',
                         'nose >= 1.3.7',